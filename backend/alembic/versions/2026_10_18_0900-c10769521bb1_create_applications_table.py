@@ -0,0 +1,55 @@
+"""create applications table
+
+Revision ID: c10769521bb1
+Revises: 732a9cab3950
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c10769521bb1'
+down_revision = '732a9cab3950'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The applications table was previously created by create_all at startup,
+    # so only create it when it is missing
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('applications'):
+        op.create_table(
+            'applications',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('first_name', sa.String(length=100), nullable=False),
+            sa.Column('last_name', sa.String(length=100), nullable=False),
+            sa.Column('email', sa.String(length=255), nullable=False),
+            sa.Column('phone', sa.String(length=50), nullable=False),
+            sa.Column('linkedin_url', sa.String(length=500), nullable=True),
+            sa.Column('resume_filename', sa.String(length=500), nullable=False),
+            sa.Column('resume_path', sa.String(length=1000), nullable=False),
+            sa.Column('note', sa.Text(), nullable=True),
+            sa.Column(
+                'created_at',
+                sa.DateTime(timezone=True),
+                server_default=sa.text('now()'),
+                nullable=False
+            ),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_applications_id'), 'applications', ['id'], unique=False)
+        op.create_index(op.f('ix_applications_email'), 'applications', ['email'], unique=False)
+
+    # Resume blobs are reference-counted by resume_path
+    op.create_index(
+        op.f('ix_applications_resume_path'), 'applications', ['resume_path'], unique=False
+    )
+
+
+def downgrade() -> None:
+    # The applications table may predate this migration, so it is left in place
+    op.drop_index(op.f('ix_applications_resume_path'), table_name='applications')
@@ -0,0 +1,47 @@
+"""add keyset pagination indexes
+
+Revision ID: ac51a57f9ccb
+Revises: c10769521bb1
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'ac51a57f9ccb'
+down_revision = 'c10769521bb1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Composite (created_at, id) indexes serve the keyset range seek and
+    # its ORDER BY; built concurrently so existing tables stay writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_leads_created_id',
+            'leads',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'idx_applications_created_id',
+            'applications',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_applications_created_id',
+            table_name='applications',
+            postgresql_concurrently=True
+        )
+        op.drop_index('idx_leads_created_id', table_name='leads', postgresql_concurrently=True)
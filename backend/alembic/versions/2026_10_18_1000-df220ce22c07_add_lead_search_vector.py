@@ -0,0 +1,58 @@
+"""add lead search vector
+
+Revision ID: df220ce22c07
+Revises: ac51a57f9ccb
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'df220ce22c07'
+down_revision = 'ac51a57f9ccb'
+branch_labels = None
+depends_on = None
+
+# Must match SEARCH_VECTOR_EXPRESSION in app/models/lead.py
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(company, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(job_title, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(project_description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # Stored generated column: Postgres keeps it current on every write.
+    # Adding it rewrites the table once under an exclusive lock.
+    op.add_column(
+        'leads',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True
+        )
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_leads_search_vector',
+            'leads',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_leads_search_vector',
+            table_name='leads',
+            postgresql_concurrently=True
+        )
+    op.drop_column('leads', 'search_vector')
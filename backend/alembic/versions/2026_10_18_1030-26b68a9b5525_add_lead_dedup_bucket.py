@@ -0,0 +1,41 @@
+"""add lead dedup bucket
+
+Revision ID: 26b68a9b5525
+Revises: df220ce22c07
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '26b68a9b5525'
+down_revision = 'df220ce22c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable without a default: a catalog-only change. Existing rows keep
+    # NULL and therefore never conflict with each other.
+    op.add_column('leads', sa.Column('dedup_bucket', sa.BigInteger(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_leads_email_dedup_bucket',
+            'leads',
+            [sa.text('lower(email)'), 'dedup_bucket'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_leads_email_dedup_bucket',
+            table_name='leads',
+            postgresql_concurrently=True
+        )
+    op.drop_column('leads', 'dedup_bucket')
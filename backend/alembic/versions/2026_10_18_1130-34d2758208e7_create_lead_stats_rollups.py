@@ -0,0 +1,92 @@
+"""create lead stats rollups
+
+Revision ID: 34d2758208e7
+Revises: f182f43e27a9
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '34d2758208e7'
+down_revision = 'f182f43e27a9'
+branch_labels = None
+depends_on = None
+
+# Must match ROLLUP_FUNCTION, ROLLUP_TRIGGERS and REBUILD_ROLLUPS in
+# app/models/lead_stat.py
+APPLY_CHANGES = """
+        INSERT INTO lead_stats AS s (dimension, value, leads)
+        SELECT k.dimension, k.value, sum(r.delta)
+        FROM ({changes}) AS r
+        CROSS JOIN LATERAL (VALUES
+            ('total', ''),
+            ('day', to_char(r.created_at, 'YYYY-MM-DD')),
+            ('company', r.company),
+            ('job_title', r.job_title)
+        ) AS k(dimension, value)
+        GROUP BY k.dimension, k.value
+        HAVING sum(r.delta) <> 0
+        ORDER BY k.dimension, k.value
+        ON CONFLICT (dimension, value) DO UPDATE SET leads = s.leads + excluded.leads;"""
+
+NEW_ROWS = "SELECT 1 AS delta, created_at, company, job_title FROM new_rows"
+OLD_ROWS = "SELECT -1 AS delta, created_at, company, job_title FROM old_rows"
+
+ROLLUP_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION lead_stats_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN{APPLY_CHANGES.format(changes=NEW_ROWS)}
+    ELSIF TG_OP = 'UPDATE' THEN{APPLY_CHANGES.format(changes=f"{NEW_ROWS} UNION ALL {OLD_ROWS}")}
+    ELSE{APPLY_CHANGES.format(changes=OLD_ROWS)}
+    END IF;
+    RETURN NULL;
+END;
+$$"""
+
+ROLLUP_TRIGGERS = [
+    "CREATE TRIGGER lead_stats_insert AFTER INSERT ON leads "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION lead_stats_apply()",
+    "CREATE TRIGGER lead_stats_update AFTER UPDATE ON leads "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION lead_stats_apply()",
+    "CREATE TRIGGER lead_stats_delete AFTER DELETE ON leads "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION lead_stats_apply()",
+]
+
+BACKFILL = APPLY_CHANGES.format(
+    changes="SELECT 1 AS delta, created_at, company, job_title FROM leads"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'lead_stats',
+        sa.Column('dimension', sa.String(length=20), nullable=False),
+        sa.Column('value', sa.String(length=255), nullable=False),
+        sa.Column('leads', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('dimension', 'value')
+    )
+    op.create_index(
+        'idx_lead_stats_dimension_leads', 'lead_stats', ['dimension', 'leads'], unique=False
+    )
+    op.execute(ROLLUP_FUNCTION)
+    # CREATE TRIGGER locks out lead writes until this migration commits, so
+    # the backfill below neither misses nor double-counts a concurrent write
+    for statement in ROLLUP_TRIGGERS:
+        op.execute(statement)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS lead_stats_delete ON leads")
+    op.execute("DROP TRIGGER IF EXISTS lead_stats_update ON leads")
+    op.execute("DROP TRIGGER IF EXISTS lead_stats_insert ON leads")
+    op.execute("DROP FUNCTION IF EXISTS lead_stats_apply()")
+    op.drop_index('idx_lead_stats_dimension_leads', table_name='lead_stats')
+    op.drop_table('lead_stats')
@@ -0,0 +1,71 @@
+"""create resume texts table
+
+Revision ID: 54ba2c6c5b5b
+Revises: 34d2758208e7
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '54ba2c6c5b5b'
+down_revision = '34d2758208e7'
+branch_labels = None
+depends_on = None
+
+# Must match RESUME_VECTOR_EXPRESSION in app/models/resume_text.py
+RESUME_VECTOR_EXPRESSION = "to_tsvector('english', coalesce(content, ''))"
+
+
+def upgrade() -> None:
+    op.create_table(
+        'resume_texts',
+        sa.Column('blob_key', sa.String(length=1000), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.SmallInteger(), nullable=False),
+        sa.Column(
+            'next_attempt_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False
+        ),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(RESUME_VECTOR_EXPRESSION, persisted=True),
+            nullable=True
+        ),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False
+        ),
+        sa.Column('extracted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('blob_key')
+    )
+    op.create_index(
+        'idx_resume_texts_search_vector',
+        'resume_texts',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin'
+    )
+    op.create_index(
+        'idx_resume_texts_queue',
+        'resume_texts',
+        ['next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('pending', 'processing')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_resume_texts_queue', table_name='resume_texts')
+    op.drop_index('idx_resume_texts_search_vector', table_name='resume_texts')
+    op.drop_table('resume_texts')
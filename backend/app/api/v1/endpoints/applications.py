@@ -1,29 +1,71 @@
 """
 Job Application endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status,
+    UploadFile, File, Form
+)
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import aliased
+import asyncio
 import logging
 import os
-import aiofiles
-from pathlib import Path
 from datetime import datetime
+from pathlib import Path
 
+from app.core.config import settings
+from app.core.file_responses import RangedFileResponse
+from app.core.metrics import RESUME_UPLOAD_BYTES, RESUME_UPLOADS
+from app.core.responses import FastJSONResponse, trusted_rows
+from app.db.headline import headline, render_headline
+from app.db.pagination import InvalidCursorError, created_before, encode_cursor, ranked_before
+from app.db.projection import InvalidFieldsError, parse_fields, project
 from app.db.session import get_db
 from app.models.application import Application
-from app.schemas.application import ApplicationResponse
+from app.models.resume_text import RESUME_SEARCH_CONFIG, ResumeText
+from app.schemas.application import ApplicationResponse, ApplicationSearchResult
+from app.services.export import ExportFormat, export_response
+from app.services.list_cache import list_cache, mark_written
+from app.services.notifications import (
+    NotificationDispatcher, application_acknowledgement, get_notifier
+)
+from app.services.resume_text import (
+    ResumeTextExtractor, get_resume_text_extractor, queue_resume_texts
+)
+from app.services.storage import ResumeStorage, blob_sha256, get_resume_storage, release_blob
+from app.services.upload_validation import (
+    EXTENSION_FORMATS, FormatValidator, InvalidUploadError
+)
+from app.services.uploads import UploadTooLargeError
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("uploads/resumes")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
-ALLOWED_EXTENSIONS = {".pdf", ".doc", ".docx", ".txt", ".rtf"}
+ALLOWED_EXTENSIONS = tuple(EXTENSION_FORMATS)
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
+# Columns included in exports
+EXPORT_COLUMNS = (
+    Application.id,
+    Application.first_name,
+    Application.last_name,
+    Application.email,
+    Application.phone,
+    Application.linkedin_url,
+    Application.resume_filename,
+    Application.note,
+    Application.created_at,
+)
+
+# Fields selectable with `fields=` on the list endpoint, and named presets
+LIST_FIELDS = tuple(ApplicationResponse.model_fields)
+LIST_FIELD_PRESETS = {
+    "summary": ("id", "first_name", "last_name", "email", "resume_filename", "created_at"),
+}
+
 
 @router.post(
     "",
@@ -33,14 +75,18 @@ MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
     description="Submit a job application with resume upload"
 )
 async def create_application(
+    background_tasks: BackgroundTasks,
     first_name: str = Form(...),
     last_name: str = Form(...),
-    email: str = Form(...),
+    email: EmailStr = Form(...),
     phone: str = Form(...),
     resume: UploadFile = File(...),
     linkedin_url: str = Form(None),
     note: str = Form(None),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    storage: ResumeStorage = Depends(get_resume_storage),
+    notifier: NotificationDispatcher | None = Depends(get_notifier),
+    extractor: ResumeTextExtractor | None = Depends(get_resume_text_extractor)
 ) -> ApplicationResponse:
     """
     Create a new job application with resume upload
@@ -60,51 +106,78 @@ async def create_application(
                 detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
             )
         
-        # Read file content to check size
-        content = await resume.read()
-        if len(content) > MAX_FILE_SIZE:
+        # Store resume by content hash; re-submitted files are not written again.
+        # Content that does not match the extension is rejected before storage.
+        validator = FormatValidator(file_ext, deep=settings.RESUME_DEEP_VALIDATION)
+        try:
+            blob = await storage.save(db, resume, MAX_FILE_SIZE, validator=validator)
+        except UploadTooLargeError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="File size exceeds 5MB limit"
             )
+        except InvalidUploadError as e:
+            RESUME_UPLOADS.inc(1, "rejected")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
         
-        # Generate unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_filename = f"{timestamp}_{first_name}_{last_name}_{resume.filename}"
-        safe_filename = "".join(c for c in safe_filename if c.isalnum() or c in ('_', '-', '.'))
-        file_path = UPLOAD_DIR / safe_filename
-        
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(content)
+        RESUME_UPLOAD_BYTES.inc(blob.size)
+        RESUME_UPLOADS.inc(1, "stored" if blob.created else "deduplicated")
         
-        # Create database entry
-        db_application = Application(
-            first_name=first_name,
-            last_name=last_name,
-            email=email,
-            phone=phone,
-            linkedin_url=linkedin_url,
-            resume_filename=resume.filename,
-            resume_path=str(file_path),
-            note=note
+        # One commit, with the blob lock taken by save() still held: the
+        # INSERT ... RETURNING is a CTE that also queues the resume for text
+        # extraction. Committing here (get_db's commit is then a no-op) keeps
+        # the blob cleanup below in reach.
+        new_application = (
+            insert(Application)
+            .values(
+                first_name=first_name,
+                last_name=last_name,
+                email=email,
+                phone=phone,
+                linkedin_url=linkedin_url,
+                resume_filename=resume.filename,
+                resume_path=blob.key,
+                note=note
+            )
+            .returning(*Application.__table__.c)
+            .cte("new_application")
         )
-        
-        db.add(db_application)
+        queued = queue_resume_texts(select(new_application.c.resume_path)).cte("queued")
+        db_application = await db.scalar(
+            select(aliased(Application, new_application)).add_cte(queued)
+        )
+        # A SELECT as far as the list cache's statement hook can tell
+        mark_written(db, Application.__tablename__, ResumeText.__tablename__)
         await db.commit()
-        await db.refresh(db_application)
         
-        logger.info(f"New application received: {email} - {first_name} {last_name}")
+        logger.info(
+            "New application received: %s - %s %s (resume %s, %d bytes, %s)",
+            email, first_name, last_name, blob.key, blob.size,
+            "stored" if blob.created else "deduplicated"
+        )
+        if notifier is not None:
+            background_tasks.add_task(
+                notifier.enqueue, application_acknowledgement(first_name, email)
+            )
+        if extractor is not None:
+            background_tasks.add_task(extractor.notify)
         
         return ApplicationResponse.model_validate(db_application)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating application: {str(e)}", exc_info=True)
-        # Clean up file if it was saved
-        if 'file_path' in locals() and file_path.exists():
-            os.remove(file_path)
+        logger.error("Error creating application: %s", e, exc_info=True)
+        # Clean up the blob if this request stored it and nothing else references it
+        if 'blob' in locals() and blob.created:
+            try:
+                await db.rollback()
+                await release_blob(db, storage, blob.key)
+            except Exception:
+                logger.warning("Failed to clean up resume blob %s", blob.key, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to submit application: {str(e)}"
@@ -115,31 +188,238 @@ async def create_application(
     "",
     response_model=list[ApplicationResponse],
     summary="Get all applications",
-    description="Retrieve all job applications (admin only in production)"
+    description=(
+        "Retrieve all job applications (admin only in production). "
+        "With `fields`, each item contains only the requested fields."
+    )
 )
 async def get_applications(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = Query(
+        None,
+        description="Keyset cursor from X-Next-Cursor (empty string for the first page)"
+    ),
+    fields: str | None = Query(
+        None,
+        description=(
+            "Comma-separated fields to return, or `summary` "
+            f"({', '.join(LIST_FIELD_PRESETS['summary'])}); all fields by default"
+        )
+    ),
     db: AsyncSession = Depends(get_db)
-) -> list[ApplicationResponse]:
+) -> list[ApplicationResponse] | Response:
     """
-    Get all job applications with pagination
+    Get all job applications with offset or keyset (cursor) pagination
     Note: This endpoint should be protected with authentication in production
     """
     try:
-        result = await db.execute(
-            select(Application)
-            .order_by(Application.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        selected = parse_fields(fields, LIST_FIELDS, LIST_FIELD_PRESETS)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Served from memory (or as 304) until the next committed write
+    cache_key = list_cache.key(Application.__tablename__, request)
+    cached = list_cache.get(cache_key, request)
+    if cached is not None:
+        return cached
+    
+    try:
+        # Only the requested columns are read; the keyset sort key is always
+        # selected for X-Next-Cursor
+        columns = project(Application, selected, "created_at", "id")
+        query = select(*columns).order_by(Application.created_at.desc(), Application.id.desc())
+        if cursor is not None:
+            # Keyset mode: range seek past the cursor instead of skipping rows
+            if cursor:
+                query = query.where(created_before(Application.created_at, Application.id, cursor))
+        else:
+            query = query.offset(skip)
+        
+        result = await db.execute(query.limit(limit))
+        applications = result.all()
+        
+        headers = {}
+        if applications and len(applications) == limit:
+            last = applications[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+        
+        # Trusted rows: no re-validation of data we stored ourselves
+        return list_cache.put(
+            cache_key, request, trusted_rows(applications, ApplicationResponse, selected), headers
         )
-        applications = result.scalars().all()
-        return [ApplicationResponse.model_validate(app) for app in applications]
         
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
     except Exception as e:
-        logger.error(f"Error fetching applications: {str(e)}")
+        logger.error("Error fetching applications: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch applications"
         )
 
+
+@router.get(
+    "/search",
+    response_model=list[ApplicationSearchResult],
+    summary="Search applications by resume content",
+    description="Full-text search over text extracted from uploaded resumes"
+)
+async def search_applications(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=256,
+        description='Web-search syntax: words, "quoted phrases", OR, -excluded'
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Keyset cursor from X-Next-Cursor"),
+    db: AsyncSession = Depends(get_db)
+) -> list[ApplicationSearchResult] | FastJSONResponse:
+    """
+    Rank matches with ts_rank_cd and page by (rank, id).
+    
+    Resumes whose text has not been extracted yet do not match. Snippets are
+    generated only for the rows of the requested page.
+    """
+    tsquery = func.websearch_to_tsquery(RESUME_SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(ResumeText.search_vector, tsquery)
+    
+    try:
+        page = (
+            select(Application.id, ResumeText.blob_key, rank.label("rank"))
+            .join(ResumeText, ResumeText.blob_key == Application.resume_path)
+            .where(ResumeText.search_vector.bool_op("@@")(tsquery))
+            .order_by(rank.desc(), Application.id.desc())
+            .limit(limit)
+        )
+        if cursor:
+            page = page.where(ranked_before(rank, Application.id, cursor))
+        page = page.subquery()
+        
+        query = (
+            select(
+                Application,
+                page.c.rank,
+                headline(RESUME_SEARCH_CONFIG, ResumeText.content, tsquery).label("headline"),
+            )
+            .join(page, page.c.id == Application.id)
+            .join(ResumeText, ResumeText.blob_key == page.c.blob_key)
+            .order_by(page.c.rank.desc(), Application.id.desc())
+        )
+        rows = (await db.execute(query)).all()
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    except Exception as e:
+        logger.error("Error searching applications: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search applications"
+        )
+    
+    headers = {}
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.rank, last.Application.id)
+    
+    results = trusted_rows((row.Application for row in rows), ApplicationResponse)
+    for result, row in zip(results, rows):
+        result["rank"] = row.rank
+        result["headline"] = render_headline(row.headline)
+    return FastJSONResponse(results, headers=headers)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export job applications",
+    description="Stream job applications as NDJSON or CSV, optionally filtered by creation date"
+)
+async def export_applications(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    created_from: datetime | None = Query(None, description="Include rows created at or after"),
+    created_to: datetime | None = Query(None, description="Include rows created before"),
+) -> StreamingResponse:
+    """
+    Export job applications row-by-row through a server-side cursor
+    """
+    query = select(*EXPORT_COLUMNS).order_by(Application.created_at, Application.id)
+    if created_from is not None:
+        query = query.where(Application.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Application.created_at < created_to)
+    
+    return export_response(query, fmt, "applications")
+
+
+@router.get(
+    "/{application_id}/resume",
+    response_class=FileResponse,
+    summary="Download an application's resume",
+    description="Serve the stored resume file, with Range and If-None-Match support"
+)
+async def get_application_resume(
+    application_id: int,
+    download: bool = Query(False, description="Send as an attachment instead of inline"),
+    db: AsyncSession = Depends(get_db),
+    storage: ResumeStorage = Depends(get_resume_storage)
+) -> Response:
+    """
+    Serve one application's resume.
+    
+    The blob key comes from a single primary-key lookup. Content-addressed
+    blobs get their SHA-256 as a strong ETag, so browsers revalidate with
+    If-None-Match and get 304s. Blobs in S3 redirect to a presigned URL.
+    """
+    row = (await db.execute(
+        select(Application.resume_path, Application.resume_filename)
+        .where(Application.id == application_id)
+    )).one_or_none()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+    
+    disposition = "attachment" if download else "inline"
+    path = storage.local_path(row.resume_path)
+    if path is None:
+        url = await storage.download_url(row.resume_path, row.resume_filename, disposition)
+        if url is None:
+            logger.error("Storage backend cannot serve resume %s", row.resume_path)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to serve resume"
+            )
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    
+    try:
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        logger.error("Resume %s of application %d is missing", row.resume_path, application_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume file not found"
+        )
+    
+    headers = {
+        "Cache-Control": f"private, max-age={settings.RESUME_DOWNLOAD_MAX_AGE_SECONDS}",
+        "X-Content-Type-Options": "nosniff",
+    }
+    sha256 = blob_sha256(row.resume_path)
+    if sha256 is not None:
+        headers["ETag"] = f'"{sha256}"'
+    return RangedFileResponse(
+        path,
+        headers=headers,
+        filename=row.resume_filename,
+        stat_result=stat_result,
+        content_disposition_type=disposition,
+    )
@@ -1,90 +1,450 @@
 """
 Lead endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+)
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
+import json
 import logging
+from datetime import datetime
 
+from app.core.config import settings
+from app.core.responses import FastJSONResponse, trusted_rows
+from app.db.headline import headline, render_headline
+from app.db.pagination import InvalidCursorError, created_before, encode_cursor, ranked_before
+from app.db.projection import InvalidFieldsError, parse_fields, project
 from app.db.session import get_db
-from app.models.lead import Lead
-from app.schemas.lead import LeadCreate, LeadResponse
+from app.models.lead import SEARCH_CONFIG, Lead
+from app.schemas.lead import (
+    LeadAccepted,
+    LeadBulkItemResult,
+    LeadBulkResponse,
+    LeadCreate,
+    LeadResponse,
+    LeadSearchResult,
+    LeadStats,
+)
+from app.services.export import ExportFormat, export_response, naive_utc
+from app.services.lead_queue import LeadIngestionQueue, LeadQueueFullError, get_lead_queue
+from app.services.lead_stats import get_lead_stats
+from app.services.leads import insert_leads, upsert_lead
+from app.services.notifications import (
+    NotificationDispatcher, get_notifier, lead_acknowledgement
+)
+from app.services.list_cache import list_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Columns included in exports
+EXPORT_COLUMNS = (
+    Lead.id,
+    Lead.name,
+    Lead.email,
+    Lead.company,
+    Lead.job_title,
+    Lead.phone,
+    Lead.project_description,
+    Lead.created_at,
+    Lead.updated_at,
+)
+
+# Fields selectable with `fields=` on the list endpoint, and named presets
+LIST_FIELDS = tuple(LeadResponse.model_fields)
+LIST_FIELD_PRESETS = {
+    "summary": ("id", "name", "company", "job_title", "created_at"),
+}
+
 
 @router.post(
     "",
     response_model=LeadResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Create a new lead",
-    description="Submit a contact form and create a new lead in the database"
+    description="Submit a contact form and create a new lead in the database",
+    responses={
+        status.HTTP_200_OK: {
+            "model": LeadResponse,
+            "description": "Repeat submission merged into an existing lead",
+        },
+        status.HTTP_202_ACCEPTED: {
+            "model": LeadAccepted,
+            "description": "Lead queued for a batched write (write-behind mode)",
+        },
+    },
 )
 async def create_lead(
     lead_data: LeadCreate,
-    db: AsyncSession = Depends(get_db)
-) -> LeadResponse:
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    lead_queue: LeadIngestionQueue | None = Depends(get_lead_queue),
+    notifier: NotificationDispatcher | None = Depends(get_notifier)
+) -> LeadResponse | JSONResponse:
     """
     Create a new lead from contact form submission
     """
-    try:
-        # Create new lead instance
-        db_lead = Lead(
-            name=lead_data.name,
-            email=lead_data.email,
-            company=lead_data.company,
-            job_title=lead_data.job_title,
-            phone=lead_data.phone,
-            project_description=lead_data.project_description
+    if lead_queue is not None:
+        try:
+            lead_id = await lead_queue.submit(lead_data)
+        except LeadQueueFullError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many submissions right now. Please try again shortly.",
+                headers={"Retry-After": "1"}
+            )
+        logger.info("Lead queued: %s", lead_id)
+        if notifier is not None:
+            background_tasks.add_task(
+                notifier.enqueue, lead_acknowledgement(lead_data.name, lead_data.email)
+            )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=LeadAccepted(id=lead_id).model_dump(mode="json")
         )
+    
+    try:
+        # Single INSERT ... ON CONFLICT ... RETURNING; get_db commits, no
+        # refresh round-trip
+        db_lead, inserted = await upsert_lead(db, lead_data)
         
-        # Add to database
-        db.add(db_lead)
-        await db.flush()
-        await db.refresh(db_lead)
-        
-        logger.info(f"New lead created: {db_lead.email} from {db_lead.company}")
+        if inserted:
+            logger.info("New lead created: %s from %s", db_lead.email, db_lead.company)
+            # Queued once get_db has committed; repeat submissions are not
+            # acknowledged again
+            if notifier is not None:
+                background_tasks.add_task(
+                    notifier.enqueue, lead_acknowledgement(db_lead.name, db_lead.email)
+                )
+        else:
+            response.status_code = status.HTTP_200_OK
+            logger.info("Repeat submission merged into lead %s", db_lead.id)
         
         return LeadResponse.model_validate(db_lead)
         
     except Exception as e:
-        logger.error(f"Error creating lead: {str(e)}")
+        logger.error("Error creating lead: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create lead. Please try again later."
         )
 
 
+def _parse_bulk_body(body: bytes, content_type: str) -> list:
+    """
+    Parse a bulk body as a JSON array or NDJSON (one object per line).
+
+    Lines of NDJSON that are not valid JSON are returned as None so they can
+    be reported per item.
+    """
+    if "ndjson" in content_type:
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(None)
+        return items
+
+    items = json.loads(body)
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array")
+    return items
+
+
+@router.post(
+    "/bulk",
+    response_model=LeadBulkResponse,
+    summary="Create leads in bulk",
+    description="Ingest many leads from a JSON array or NDJSON body in a single request",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/LeadCreate"},
+                    }
+                },
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def create_leads_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+) -> LeadBulkResponse:
+    """
+    Validate every item in one pass and insert the valid ones with multi-row
+    INSERT ... RETURNING statements
+    """
+    try:
+        items = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body must be a JSON array or NDJSON"
+        )
+    
+    if len(items) > settings.LEADS_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.LEADS_BULK_MAX_ITEMS} leads per request"
+        )
+    
+    results: list[LeadBulkItemResult] = []
+    valid: list[LeadCreate] = []
+    valid_results: list[LeadBulkItemResult] = []
+    for index, item in enumerate(items):
+        if item is None:
+            results.append(LeadBulkItemResult(index=index, errors=[{"msg": "Invalid JSON"}]))
+            continue
+        try:
+            lead = LeadCreate.model_validate(item)
+        except ValidationError as e:
+            results.append(LeadBulkItemResult(
+                index=index,
+                errors=e.errors(include_url=False, include_context=False, include_input=False)
+            ))
+            continue
+        item_result = LeadBulkItemResult(index=index)
+        valid.append(lead)
+        valid_results.append(item_result)
+        results.append(item_result)
+    
+    try:
+        outcomes = await insert_leads(db, valid)
+    except Exception as e:
+        logger.error("Error creating leads in bulk: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create leads. Please try again later."
+        )
+    
+    for item_result, (lead_id, inserted) in zip(valid_results, outcomes):
+        item_result.id = lead_id
+        item_result.merged = not inserted
+    
+    created = sum(1 for _, inserted in outcomes if inserted)
+    merged = len(outcomes) - created
+    failed = len(items) - len(outcomes)
+    logger.info(
+        "Bulk lead ingestion: %d created, %d merged, %d rejected", created, merged, failed
+    )
+    
+    return LeadBulkResponse(created=created, merged=merged, failed=failed, results=results)
+
+
 @router.get(
     "",
     response_model=list[LeadResponse],
     summary="Get all leads",
-    description="Retrieve all leads from the database (admin only in production)"
+    description=(
+        "Retrieve all leads from the database (admin only in production). "
+        "With `fields`, each item contains only the requested fields."
+    )
 )
 async def get_leads(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = Query(
+        None,
+        description="Keyset cursor from X-Next-Cursor (empty string for the first page)"
+    ),
+    fields: str | None = Query(
+        None,
+        description=(
+            "Comma-separated fields to return, or `summary` "
+            f"({', '.join(LIST_FIELD_PRESETS['summary'])}); all fields by default"
+        )
+    ),
     db: AsyncSession = Depends(get_db)
-) -> list[LeadResponse]:
+) -> list[LeadResponse] | Response:
     """
-    Get all leads with pagination
+    Get all leads with offset or keyset (cursor) pagination
     Note: This endpoint should be protected with authentication in production
     """
     try:
-        result = await db.execute(
-            select(Lead)
-            .order_by(Lead.created_at.desc())
-            .offset(skip)
+        selected = parse_fields(fields, LIST_FIELDS, LIST_FIELD_PRESETS)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Served from memory (or as 304) until the next committed write
+    cache_key = list_cache.key(Lead.__tablename__, request)
+    cached = list_cache.get(cache_key, request)
+    if cached is not None:
+        return cached
+    
+    try:
+        # Only the requested columns are read; the keyset sort key is always
+        # selected for X-Next-Cursor
+        columns = project(Lead, selected, "created_at", "id")
+        query = select(*columns).order_by(Lead.created_at.desc(), Lead.id.desc())
+        if cursor is not None:
+            # Keyset mode: range seek past the cursor instead of skipping rows
+            if cursor:
+                query = query.where(created_before(Lead.created_at, Lead.id, cursor))
+        else:
+            query = query.offset(skip)
+        
+        result = await db.execute(query.limit(limit))
+        leads = result.all()
+        
+        headers = {}
+        if leads and len(leads) == limit:
+            last = leads[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+        
+        # Trusted rows: skip LeadResponse's input validators
+        content = trusted_rows(leads, LeadResponse, selected)
+        return list_cache.put(cache_key, request, content, headers)
+        
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    except Exception as e:
+        logger.error("Error fetching leads: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch leads"
+        )
+
+
+@router.get(
+    "/search",
+    response_model=list[LeadSearchResult],
+    summary="Search leads",
+    description="Full-text search over company, job title and project description"
+)
+async def search_leads(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=256,
+        description='Web-search syntax: words, "quoted phrases", OR, -excluded'
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Keyset cursor from X-Next-Cursor"),
+    db: AsyncSession = Depends(get_db)
+) -> list[LeadSearchResult] | FastJSONResponse:
+    """
+    Rank matches with ts_rank_cd and page by (rank, id).
+    
+    Matching uses the GIN index on `search_vector`; snippets are generated
+    only for the rows of the requested page.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(Lead.search_vector, tsquery)
+    
+    try:
+        page = (
+            select(Lead.id, rank.label("rank"))
+            .where(Lead.search_vector.bool_op("@@")(tsquery))
+            .order_by(rank.desc(), Lead.id.desc())
             .limit(limit)
         )
-        leads = result.scalars().all()
-        return [LeadResponse.model_validate(lead) for lead in leads]
+        if cursor:
+            page = page.where(ranked_before(rank, Lead.id, cursor))
+        page = page.subquery()
         
+        query = (
+            select(
+                Lead,
+                page.c.rank,
+                headline(SEARCH_CONFIG, Lead.project_description, tsquery).label("headline"),
+            )
+            .join(page, page.c.id == Lead.id)
+            .order_by(page.c.rank.desc(), Lead.id.desc())
+        )
+        rows = (await db.execute(query)).all()
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
     except Exception as e:
-        logger.error(f"Error fetching leads: {str(e)}")
+        logger.error("Error searching leads: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch leads"
+            detail="Failed to search leads"
         )
+    
+    headers = {}
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.rank, last.Lead.id)
+    
+    results = trusted_rows((row.Lead for row in rows), LeadResponse)
+    for result, row in zip(results, rows):
+        result["rank"] = row.rank
+        result["headline"] = render_headline(row.headline)
+    return FastJSONResponse(results, headers=headers)
+
+
+@router.get(
+    "/stats",
+    response_model=LeadStats,
+    summary="Lead analytics",
+    description="Leads per day, per company and per job title, from incrementally kept rollups"
+)
+async def lead_stats(
+    request: Request,
+    days: int = Query(30, ge=1, le=366, description="Days of per-day counts, including today"),
+    top: int = Query(10, ge=1, le=100, description="Companies and job titles to return"),
+    db: AsyncSession = Depends(get_db)
+) -> LeadStats | Response:
+    """
+    Read the rollup table; cost is independent of the number of leads
+    """
+    # Rollups change with every lead write, so they share the leads
+    # table's cache generation
+    cache_key = list_cache.key(Lead.__tablename__, request)
+    cached = list_cache.get(cache_key, request)
+    if cached is not None:
+        return cached
+    
+    try:
+        stats = await get_lead_stats(db, days, top)
+    except Exception as e:
+        logger.error("Error fetching lead stats: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch lead stats"
+        )
+    
+    return list_cache.put(cache_key, request, stats.model_dump(mode="json"))
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export leads",
+    description="Stream leads as NDJSON or CSV, optionally filtered by creation date"
+)
+async def export_leads(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    created_from: datetime | None = Query(None, description="Include rows created at or after"),
+    created_to: datetime | None = Query(None, description="Include rows created before"),
+) -> StreamingResponse:
+    """
+    Export leads row-by-row through a server-side cursor
+    """
+    query = select(*EXPORT_COLUMNS).order_by(Lead.created_at, Lead.id)
+    if created_from is not None:
+        query = query.where(Lead.created_at >= naive_utc(created_from))
+    if created_to is not None:
+        query = query.where(Lead.created_at < naive_utc(created_to))
+    
+    return export_response(query, fmt, "leads")
 
@@ -20,14 +20,44 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Nirvahatech API"
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
+    OPENAPI_ENABLED: bool = True  # serve the OpenAPI schema and /docs
+    
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    # Comma-separated logger=rate pairs, e.g. "app.api.v1.endpoints.leads=0.1"
+    LOG_SAMPLE_RATES: str = ""
     
     # Database
+    DB_ECHO: bool = False  # log every SQL statement; keep off in production
     POSTGRES_SERVER: str = "localhost"
     POSTGRES_PORT: int = 5432
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "nirvahatech"
     
+    # Startup schema check: "create_all" creates missing tables, "revision"
+    # verifies alembic_version with a single query, "skip" does nothing
+    DB_STARTUP_CHECK: str = "create_all"
+    DB_EXPECTED_REVISION: str | None = None  # fail startup unless the DB is at this revision
+    
+    # "pooled" keeps a connection pool per process. "serverless" is for
+    # short-lived invocations and transaction-mode poolers (pgbouncer, Neon's
+    # pooled endpoint): no or a tiny pool and no named prepared statements
+    DB_MODE: str = "pooled"
+    DB_SERVERLESS_POOL_SIZE: int = 0  # 0 opens a fresh connection per checkout (NullPool)
+    
+    # Connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = -1  # seconds before a connection is replaced; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    
+    # Readiness probe
+    READINESS_CACHE_TTL_SECONDS: float = 5.0
+    READINESS_DB_TIMEOUT_SECONDS: float = 2.0
+    
     @property
     def DATABASE_URL(self) -> str:
         return (
@@ -44,13 +74,96 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in self.BACKEND_CORS_ORIGINS.split(",") if origin.strip()]
         return []
     
-    # Email settings (for future notifications)
+    # Prometheus metrics at /metrics
+    METRICS_ENABLED: bool = True
+    
+    # In-process cache of GET /leads and GET /applications responses.
+    # Local writes invalidate it at once; the TTL bounds staleness from
+    # writes made by other workers
+    LIST_CACHE_ENABLED: bool = True
+    LIST_CACHE_TTL_SECONDS: float = 5.0
+    LIST_CACHE_MAX_ENTRIES: int = 256
+    
+    # Bulk lead ingestion
+    LEADS_BULK_MAX_ITEMS: int = 10000
+    
+    # Repeat submissions from the same email within the same window of this
+    # many seconds merge into one lead; 0 disables deduplication
+    LEADS_DEDUP_WINDOW_SECONDS: int = 600
+    
+    # Per-client-IP token buckets for public submission endpoints
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LEADS_PER_MINUTE: int = 10
+    RATE_LIMIT_LEADS_BURST: int = 5
+    RATE_LIMIT_APPLICATIONS_PER_MINUTE: int = 5
+    RATE_LIMIT_APPLICATIONS_BURST: int = 3
+    RATE_LIMIT_MAX_CLIENTS: int = 100000  # buckets kept in memory per process
+    # Proxies in front of the app (e.g. 1 behind an ALB or on Vercel). The
+    # client IP is then read from X-Forwarded-For instead of the connection
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = 0
+    
+    # Idempotency-Key support for POST /leads and POST /applications
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_TTL_SECONDS: int = 86400  # how long a stored response is replayed
+    IDEMPOTENCY_LOCK_SECONDS: int = 60  # claim lease of a request still running
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # how long a duplicate waits for the first
+    IDEMPOTENCY_CACHE_SIZE: int = 1024  # responses kept in the per-process LRU
+    
+    # Write-behind lead ingestion (POST /leads returns 202 and writes in batches)
+    LEADS_WRITE_BEHIND: bool = False
+    LEADS_QUEUE_MAX_SIZE: int = 10000
+    LEADS_FLUSH_BATCH_SIZE: int = 500
+    LEADS_FLUSH_INTERVAL_SECONDS: float = 0.5
+    LEADS_FLUSH_MAX_RETRIES: int = 5  # attempts before a batch goes to the spill file
+    LEADS_SPILL_FILE: str = "spool/leads.ndjson"  # replayed once the database is back
+    LEADS_ENQUEUE_TIMEOUT_SECONDS: float = 1.0
+    LEADS_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+    
+    # Resume storage ("local" or "s3")
+    RESUME_STORAGE_BACKEND: str = "local"
+    RESUME_STORAGE_DIR: str = "uploads/resumes"
+    # Structural checks on uploads after the file signature sniff
+    RESUME_DEEP_VALIDATION: bool = True
+    # Browser cache lifetime of resume downloads, revalidated by ETag after
+    RESUME_DOWNLOAD_MAX_AGE_SECONDS: int = 3600
+    S3_BUCKET: str = ""
+    S3_PREFIX: str = "resumes"
+    S3_ENDPOINT_URL: str = ""
+    S3_REGION: str = ""
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+    
+    # Background resume text extraction for search. Stored resumes are always
+    # queued; the extractor runs in processes where this is enabled
+    RESUME_TEXT_EXTRACTION_ENABLED: bool = True
+    RESUME_TEXT_WORKERS: int = 1  # parser processes
+    RESUME_TEXT_BATCH_SIZE: int = 10  # rows claimed per pass
+    RESUME_TEXT_POLL_SECONDS: float = 30.0  # check for work queued elsewhere
+    RESUME_TEXT_MAX_ATTEMPTS: int = 3
+    RESUME_TEXT_MAX_CHARS: int = 200000  # extracted text is truncated
+    RESUME_TEXT_TIMEOUT_SECONDS: float = 60.0  # per file
+    RESUME_TEXT_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+    
+    # Email settings
     SMTP_HOST: str = ""
     SMTP_PORT: int = 587
     SMTP_USER: str = ""
     SMTP_PASSWORD: str = ""
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 10.0
     EMAILS_FROM_EMAIL: str = "noreply@nirvahatech.com"
     EMAILS_FROM_NAME: str = "Nirvahatech"
+    
+    # Acknowledgement emails for leads and applications, sent in the
+    # background over persistent SMTP connections
+    NOTIFICATIONS_ENABLED: bool = False
+    NOTIFICATIONS_QUEUE_MAX_SIZE: int = 1000  # further emails are dropped
+    NOTIFICATIONS_SMTP_CONNECTIONS: int = 2
+    NOTIFICATIONS_BATCH_SIZE: int = 20  # emails sent per connection use
+    NOTIFICATIONS_BATCH_INTERVAL_SECONDS: float = 0.5  # wait to fill a batch
+    NOTIFICATIONS_MAX_RETRIES: int = 5
+    NOTIFICATIONS_IDLE_SECONDS: float = 60.0  # close idle SMTP connections
+    NOTIFICATIONS_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
 
 
 settings = Settings()
@@ -0,0 +1,154 @@
+"""
+File responses with Range and conditional request support
+
+Starlette's FileResponse always sends the whole file. RangedFileResponse
+adds single-range `Range` requests (206, or 416 past the end of the file),
+`If-Range`, and `If-None-Match` (304). Requests for several ranges get the
+whole file, which RFC 9110 allows. The body goes out through the ASGI
+zero-copy extension (`http.response.zerocopysend`, i.e. sendfile) when the
+server offers it, and in chunks read in a worker thread otherwise.
+"""
+import os
+import re
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)")
+
+# Headers repeated on 304 responses (RFC 9110 section 15.4.5)
+NOT_MODIFIED_HEADERS = ("cache-control", "content-location", "etag", "expires", "vary")
+
+
+class RangeNotSatisfiableError(Exception):
+    """
+    Raised when a Range header selects no bytes of the file
+    """
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Resolve a single byte range to inclusive (start, end) offsets.
+
+    Returns None when the header should be ignored: several ranges, another
+    unit or invalid syntax.
+    """
+    match = RANGE_PATTERN.fullmatch(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiableError
+        return max(0, size - length), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against `etag`
+    """
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates or "*" in candidates
+
+
+class RangedFileResponse(FileResponse):
+    """
+    FileResponse that honours Range, If-Range and If-None-Match
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.stat_result is None:
+            self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            self.set_stat_headers(self.stat_result)
+        request_headers = Headers(scope=scope)
+        size = self.stat_result.st_size
+        etag = self.headers["etag"]
+
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            headers = {
+                name: value for name, value in self.headers.items() if name in NOT_MODIFIED_HEADERS
+            }
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+            return
+
+        self.headers["accept-ranges"] = "bytes"
+        start, end = 0, size - 1
+        range_header = request_headers.get("range")
+        if range_header and self._if_range(request_headers.get("if-range"), etag):
+            try:
+                byte_range = parse_range(range_header, size)
+            except RangeNotSatisfiableError:
+                await Response(status_code=416, headers={"content-range": f"bytes */{size}"})(
+                    scope, receive, send
+                )
+                return
+            if byte_range is not None:
+                start, end = byte_range
+                self.status_code = 206
+                self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+                self.headers["content-length"] = str(end - start + 1)
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        count = end - start + 1
+        if scope["method"].upper() == "HEAD" or count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopysend" in scope.get("extensions", {}):
+            file = await anyio.to_thread.run_sync(open, self.path, "rb")
+            try:
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": file,
+                        "offset": start,
+                        "count": count,
+                        "more_body": False,
+                    }
+                )
+            finally:
+                file.close()
+        else:
+            await self._send_chunks(send, start, count)
+
+        if self.background is not None:
+            await self.background()
+
+    def _if_range(self, header: str | None, etag: str) -> bool:
+        # A stale If-Range validator means "send the whole file"
+        if header is None:
+            return True
+        if header.startswith("W/"):
+            return False
+        return header == etag or header == self.headers.get("last-modified")
+
+    async def _send_chunks(self, send: Send, start: int, count: int) -> None:
+        remaining = count
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                remaining -= len(chunk)
+                more_body = remaining > 0 and bool(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                if not more_body:
+                    break
@@ -0,0 +1,440 @@
+"""
+Idempotency-Key support for create endpoints
+
+A POST carrying an `Idempotency-Key` header runs at most once per key. Its
+2xx response is stored together with a fingerprint of the request, and later
+requests with the same key and the same payload get it back verbatim without
+being validated or written anywhere. Reusing a key for a different payload is
+answered with 422. Completed responses are looked up in a per-process LRU first and in the
+`idempotency_keys` table second, so replays also work across workers.
+
+A duplicate that arrives while the first request is still running waits for
+it. On the same worker it waits on an in-process future; on another worker
+it polls the claimed row.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+import asyncio
+import hashlib
+import logging
+import random
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.session import AsyncSessionLocal
+from app.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 255
+# Larger responses are passed through but not stored
+MAX_STORED_BODY = 64 * 1024
+# How often a duplicate on another worker re-checks the claimed row
+POLL_INTERVAL = 0.1
+# Fraction of stores that also purge expired rows
+PURGE_PROBABILITY = 0.01
+
+REPLAY_HEADER = (b"idempotent-replayed", b"true")
+
+# Headers that describe the original exchange rather than its result
+_TRANSIENT_HEADERS = {b"content-length", b"date", b"server", b"x-request-id"}
+
+
+@dataclass
+class StoredResponse:
+    """
+    A completed response kept for replay
+    """
+
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    fingerprint: str
+
+    async def send(self, send: Send) -> None:
+        headers = [
+            *self.headers,
+            (b"content-length", str(len(self.body)).encode()),
+            REPLAY_HEADER,
+        ]
+        await send({"type": "http.response.start", "status": self.status, "headers": headers})
+        await send({"type": "http.response.body", "body": self.body})
+
+
+class RequestFingerprint:
+    """
+    SHA-256 of a request's media type and body, updated as the body streams.
+
+    Multipart boundaries are random per request, so they are left out and a
+    retry that re-encodes the same form gets the same fingerprint.
+    """
+
+    def __init__(self, scope: Scope):
+        content_type = b""
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                content_type = value
+                break
+        media_type, _, params = content_type.partition(b";")
+        self._boundary = b""
+        for param in params.split(b";"):
+            name, _, value = param.strip().partition(b"=")
+            if name.lower() == b"boundary":
+                self._boundary = value.strip(b'"')
+        self._hash = hashlib.sha256(media_type.strip().lower() + b"\n")
+        # Held back in case it is the start of a boundary split across chunks
+        self._tail = b""
+        self.complete = False
+
+    def update(self, message: Message) -> None:
+        if message["type"] != "http.request" or self.complete:
+            return
+        data = self._tail + message.get("body", b"")
+        if self._boundary:
+            data = data.replace(self._boundary, b"")
+            split = max(len(data) - len(self._boundary) + 1, 0)
+            data, self._tail = data[:split], data[split:]
+        self._hash.update(data)
+        if not message.get("more_body", False):
+            self._hash.update(self._tail)
+            self._tail = b""
+            self.complete = True
+
+    async def read(self, receive: Receive) -> bool:
+        """
+        Consume the rest of the body, returning False if the client went away
+        """
+        while not self.complete:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return False
+            self.update(message)
+        return True
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class ResponseCache:
+    """
+    Bounded LRU of stored responses with a per-entry TTL
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, StoredResponse]] = OrderedDict()
+
+    def get(self, key: str) -> StoredResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, response: StoredResponse) -> None:
+        self._entries[key] = (monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+class KeyInProgressError(Exception):
+    """
+    Raised when the request holding a key does not finish in time
+    """
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def claim_key(key: str, lease: float) -> bool:
+    """
+    Claim `key` for this request in one statement.
+
+    Succeeds when the key is new or its previous claim or stored response
+    has expired.
+    """
+    now = _utcnow()
+    values = {"key": key, "created_at": now, "expires_at": now + timedelta(seconds=lease)}
+    stmt = pg_insert(IdempotencyKey).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.key],
+        set_={
+            **values,
+            "status_code": None,
+            "headers": None,
+            "body": None,
+            "fingerprint": None,
+        },
+        where=IdempotencyKey.expires_at < now,
+    ).returning(IdempotencyKey.key)
+    async with AsyncSessionLocal() as session:
+        claimed = (await session.execute(stmt)).first() is not None
+        await session.commit()
+    return claimed
+
+
+async def load_key(key: str) -> tuple[bool, StoredResponse | None]:
+    """
+    Look up `key`, returning whether it is held and its stored response, if any
+    """
+    stmt = select(
+        IdempotencyKey.status_code,
+        IdempotencyKey.headers,
+        IdempotencyKey.body,
+        IdempotencyKey.fingerprint,
+    ).where(IdempotencyKey.key == key, IdempotencyKey.expires_at >= _utcnow())
+    async with AsyncSessionLocal() as session:
+        row = (await session.execute(stmt)).first()
+    if row is None:
+        return False, None
+    if row.status_code is None:
+        return True, None
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in row.headers]
+    return True, StoredResponse(
+        status=row.status_code, headers=headers, body=row.body, fingerprint=row.fingerprint
+    )
+
+
+async def store_key(key: str, response: StoredResponse, ttl: float) -> None:
+    """
+    Save the response for `key`, occasionally purging expired keys
+    """
+    now = _utcnow()
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .values(
+                status_code=response.status,
+                headers=[[n.decode("latin-1"), v.decode("latin-1")] for n, v in response.headers],
+                body=response.body,
+                fingerprint=response.fingerprint,
+                expires_at=now + timedelta(seconds=ttl),
+            )
+        )
+        if random.random() < PURGE_PROBABILITY:
+            await session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < now))
+        await session.commit()
+
+
+async def release_key(key: str) -> None:
+    """
+    Drop an unfinished claim so the request can be retried with the same key
+    """
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)
+            )
+        )
+        await session.commit()
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware honouring `Idempotency-Key` on POSTs to `paths`.
+
+    Only 2xx responses are stored. Anything else, including errors, releases
+    the key, so the client can correct the request or retry it with the same
+    key. Mount it inside CORS so replays get CORS
+    headers for the replaying origin.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: list[str],
+        ttl: float,
+        lock_lease: float,
+        wait_timeout: float,
+        cache_size: int,
+    ):
+        self.app = app
+        self.paths = {path.rstrip("/") for path in paths}
+        self.ttl = ttl
+        self.lock_lease = lock_lease
+        self.wait_timeout = wait_timeout
+        self.cache = ResponseCache(cache_size, ttl)
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"].rstrip("/")
+        if path not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = None
+        for name, value in scope["headers"]:
+            if name == b"idempotency-key":
+                idempotency_key = value.decode("latin-1").strip()
+                break
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters"},
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+
+        key = f"{path}:{idempotency_key}"
+        fingerprint = RequestFingerprint(scope)
+        deadline = monotonic() + self.wait_timeout
+        while True:
+            cached = self.cache.get(key)
+            if cached is not None:
+                await self._replay(cached, fingerprint, scope, receive, send)
+                return
+            pending = self._in_flight.get(key)
+            if pending is None:
+                break
+            try:
+                await asyncio.wait_for(asyncio.shield(pending), max(deadline - monotonic(), 0))
+            except asyncio.TimeoutError:
+                await self._in_progress(scope, receive, send)
+                return
+            # Either the response is cached now or the first request failed
+            # and released the key, in which case this one runs
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            await self._handle(key, fingerprint, deadline, scope, receive, send)
+        finally:
+            del self._in_flight[key]
+            future.set_result(None)
+
+    async def _handle(
+        self,
+        key: str,
+        fingerprint: RequestFingerprint,
+        deadline: float,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        try:
+            stored = await self._claim_or_wait(key, deadline)
+        except KeyInProgressError:
+            await self._in_progress(scope, receive, send)
+            return
+        except Exception as e:
+            # Fail open: the endpoint still works, just without the guarantee
+            logger.warning("Idempotency store unavailable, processing %s anyway: %s", key, e)
+            await self.app(scope, receive, send)
+            return
+
+        if stored is not None:
+            self.cache.put(key, stored)
+            await self._replay(stored, fingerprint, scope, receive, send)
+            return
+
+        status = 500
+        headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name not in _TRANSIENT_HEADERS and not name.startswith(b"access-control-")
+                ]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            fingerprint.update(message)
+            return message
+
+        completed = False
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+            completed = True
+        finally:
+            body = b"".join(chunks)
+            try:
+                if (
+                    completed
+                    and 200 <= status < 300
+                    and fingerprint.complete
+                    and len(body) <= MAX_STORED_BODY
+                ):
+                    response = StoredResponse(
+                        status=status,
+                        headers=headers,
+                        body=body,
+                        fingerprint=fingerprint.hexdigest(),
+                    )
+                    self.cache.put(key, response)
+                    await store_key(key, response, self.ttl)
+                else:
+                    await release_key(key)
+            except Exception as e:
+                logger.warning("Failed to record idempotent response for %s: %s", key, e)
+
+    async def _claim_or_wait(self, key: str, deadline: float) -> StoredResponse | None:
+        """
+        Claim the key (returns None) or wait for the stored response of the
+        request on another worker that holds it
+        """
+        while True:
+            if await claim_key(key, self.lock_lease):
+                return None
+            held, stored = await load_key(key)
+            if stored is not None:
+                return stored
+            if not held:
+                # Released or expired since the claim attempt
+                continue
+            if monotonic() >= deadline:
+                raise KeyInProgressError(key)
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def _replay(
+        self,
+        stored: StoredResponse,
+        fingerprint: RequestFingerprint,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if not await fingerprint.read(receive):
+            return
+        if fingerprint.hexdigest() != stored.fingerprint:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key was already used for a different request"},
+                status_code=422,
+            )
+            await response(scope, receive, send)
+            return
+        await stored.send(send)
+
+    async def _in_progress(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            {"detail": "A request with this Idempotency-Key is still being processed"},
+            status_code=409,
+            headers={"Retry-After": "1"},
+        )
+        await response(scope, receive, send)
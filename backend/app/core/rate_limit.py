@@ -0,0 +1,163 @@
+"""
+In-process token-bucket rate limiting
+
+Each (client IP, route) pair gets a bucket that refills at `rate` tokens
+per second up to `burst`. Buckets live in a fixed number of shards, plain
+dicts in insertion order. A shard is only swept when it grows past its
+capacity: idle buckets (refilled to full, so indistinguishable from new
+ones) are dropped first, then the oldest. Sharding keeps each sweep small.
+
+State is per process, so with N workers a client gets up to N times the
+configured rate. That is enough to stop form-spamming bots without a
+shared store.
+
+Behind a proxy every connection comes from the proxy's address, so unless
+`trusted_proxy_hops` is set all clients would share one bucket. The first
+forwarded request seen without it logs a warning.
+"""
+from dataclasses import dataclass
+from math import ceil
+from time import monotonic
+import logging
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import RATE_LIMITED_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# Fraction of a shard evicted when sweeping idle buckets is not enough
+EVICT_FRACTION = 0.1
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Token-bucket parameters: sustained requests per second and burst size
+    """
+
+    rate: float
+    burst: int
+
+    @classmethod
+    def per_minute(cls, requests: int, burst: int) -> "RateLimit":
+        return cls(rate=requests / 60, burst=burst)
+
+
+class TokenBuckets:
+    """
+    Sharded, bounded map of token buckets keyed by (client, route)
+    """
+
+    def __init__(self, max_entries: int, idle_after: float, shards: int = 16):
+        # A bucket untouched for `idle_after` seconds (the longest burst/rate
+        # of any limit) is full again, so forgetting it changes nothing
+        self.idle_after = idle_after
+        self._shards: list[dict[tuple[str, str], list[float]]] = [{} for _ in range(shards)]
+        self._shard_capacity = max(max_entries // shards, 1)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def acquire(self, key: tuple[str, str], limit: RateLimit) -> float:
+        """
+        Take a token for `key`. Returns 0 when allowed, otherwise the number
+        of seconds until a token is available.
+        """
+        now = monotonic()
+        shard = self._shards[hash(key) % len(self._shards)]
+        bucket = shard.get(key)
+        if bucket is None:
+            if len(shard) >= self._shard_capacity:
+                self._evict(shard, now)
+            shard[key] = [limit.burst - 1.0, now]
+            return 0.0
+
+        tokens = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / limit.rate
+
+    def _evict(self, shard: dict, now: float) -> None:
+        for key in [k for k, (_, last) in shard.items() if now - last >= self.idle_after]:
+            del shard[key]
+        if len(shard) >= self._shard_capacity:
+            for key in list(shard)[: max(int(len(shard) * EVICT_FRACTION), 1)]:
+                del shard[key]
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware rejecting over-limit POSTs with 429.
+
+    Runs before the request body is read, so rejected requests never reach
+    validation, multipart parsing or the database.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: dict[str, RateLimit],
+        max_entries: int,
+        trusted_proxy_hops: int = 0,
+    ):
+        self.app = app
+        self.limits = {path.rstrip("/"): limit for path, limit in limits.items()}
+        self.trusted_proxy_hops = trusted_proxy_hops
+        self._warned_unconfigured_proxy = False
+        idle_after = max((limit.burst / limit.rate for limit in limits.values()), default=0)
+        self.buckets = TokenBuckets(max_entries, idle_after)
+
+    def _client_ip(self, scope: Scope) -> str:
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        for name, value in scope["headers"]:
+            if name != b"x-forwarded-for":
+                continue
+            if not self.trusted_proxy_hops:
+                self._warn_unconfigured_proxy(client_ip)
+                break
+            # Each of our proxies appends the address it saw, so the entry
+            # `trusted_proxy_hops` from the end is the client; anything
+            # before it is client-supplied
+            hops = value.decode("latin-1").split(",")
+            return hops[max(len(hops) - self.trusted_proxy_hops, 0)].strip()
+        return client_ip
+
+    def _warn_unconfigured_proxy(self, client_ip: str) -> None:
+        if self._warned_unconfigured_proxy:
+            return
+        self._warned_unconfigured_proxy = True
+        logger.warning(
+            "Rate limiting by connection address, but requests carry X-Forwarded-For "
+            "(from %s). Behind a proxy all clients then share one bucket; set "
+            "RATE_LIMIT_TRUSTED_PROXY_HOPS to the number of proxies in front of the app.",
+            client_ip,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"].rstrip("/")
+        limit = self.limits.get(path)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self.buckets.acquire((self._client_ip(scope), path), limit)
+        if not retry_after:
+            await self.app(scope, receive, send)
+            return
+
+        RATE_LIMITED_REQUESTS.inc(1, path)
+        response = JSONResponse(
+            {"detail": "Too many requests. Please try again later."},
+            status_code=429,
+            headers={"Retry-After": str(ceil(retry_after))},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,34 @@
+"""
+Highlighted search snippets
+
+ts_headline copies document text into the snippet unescaped, so HTML start
+and stop selectors would hand stored markup straight to the client. Matches
+are delimited with control characters instead (removed from the document
+first, so it cannot forge them), and the snippet is HTML-escaped before they
+become `<mark>` tags.
+"""
+from html import escape
+
+from sqlalchemy import ColumnElement, func
+
+START_SEL = "\x02"
+STOP_SEL = "\x03"
+
+HEADLINE_OPTIONS = (
+    f"StartSel={START_SEL}, StopSel={STOP_SEL}, MaxFragments=2, MaxWords=30, MinWords=10"
+)
+
+
+def headline(config: str, document: ColumnElement, tsquery: ColumnElement) -> ColumnElement:
+    """
+    ts_headline of `document` with matches between START_SEL and STOP_SEL
+    """
+    document = func.translate(document, START_SEL + STOP_SEL, "")
+    return func.ts_headline(config, document, tsquery, HEADLINE_OPTIONS)
+
+
+def render_headline(snippet: str) -> str:
+    """
+    HTML-escape a `headline` snippet and wrap its matches in <mark>
+    """
+    return escape(snippet).replace(START_SEL, "<mark>").replace(STOP_SEL, "</mark>")
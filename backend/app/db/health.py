@@ -0,0 +1,129 @@
+"""
+Database readiness and schema checks
+"""
+from dataclasses import dataclass
+from time import monotonic, perf_counter
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PingResult:
+    """
+    Outcome of a database ping
+    """
+
+    ok: bool
+    latency_ms: float
+    checked_at: float
+    error: str | None = None
+
+
+def pool_stats() -> dict:
+    """
+    Live statistics of the engine's connection pool
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"class": type(pool).__name__}
+    return {
+        "class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "waiters": getattr(pool, "waiters", 0),
+    }
+
+
+class DatabaseProbe:
+    """
+    Pings the database at most once per `ttl` seconds.
+
+    Concurrent probes within the TTL share the cached result, so frequent
+    orchestrator checks do not add a query each.
+    """
+
+    def __init__(self, ttl: float, timeout: float):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._result: PingResult | None = None
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._result is not None and monotonic() - self._result.checked_at < self.ttl
+
+    async def check(self) -> PingResult:
+        if self._fresh():
+            return self._result
+        async with self._lock:
+            if not self._fresh():
+                self._result = await self._ping()
+        return self._result
+
+    async def _ping(self) -> PingResult:
+        start = perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning("Database readiness ping failed: %s", e)
+            return PingResult(
+                ok=False,
+                latency_ms=(perf_counter() - start) * 1000,
+                checked_at=monotonic(),
+                error=type(e).__name__,
+            )
+        return PingResult(
+            ok=True,
+            latency_ms=(perf_counter() - start) * 1000,
+            checked_at=monotonic(),
+        )
+
+
+database_probe = DatabaseProbe(
+    ttl=settings.READINESS_CACHE_TTL_SECONDS,
+    timeout=settings.READINESS_DB_TIMEOUT_SECONDS,
+)
+
+
+class SchemaRevisionError(RuntimeError):
+    """
+    Raised when the database is not at the expected migration revision
+    """
+
+
+async def verify_schema_revision(expected: str | None = None) -> list[str]:
+    """
+    Read the applied Alembic revision(s) with a single query.
+
+    This replaces `create_all` at startup where the schema is managed by
+    migrations: one round trip instead of a catalog lookup per table.
+    Raises SchemaRevisionError when the database has not been migrated or
+    `expected` is given and not among the applied revisions.
+    """
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            revisions = list(result.scalars())
+    except ProgrammingError as e:
+        raise SchemaRevisionError("Database has not been migrated (no alembic_version)") from e
+
+    if not revisions:
+        raise SchemaRevisionError("Database has not been migrated (alembic_version is empty)")
+    if expected and expected not in revisions:
+        raise SchemaRevisionError(
+            f"Database is at revision {', '.join(revisions)}, expected {expected}"
+        )
+    return revisions
@@ -0,0 +1,65 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is the opaque, URL-safe encoding of the sort key of the last row
+on a page. The next page is fetched with a range seek on that key instead
+of an OFFSET, so every page costs the same regardless of depth and rows
+inserted between fetches do not shift the results.
+"""
+from datetime import datetime
+from typing import Any
+import base64
+import binascii
+import json
+
+from sqlalchemy import ColumnElement, tuple_
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded
+    """
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode sort-key values into an opaque cursor
+    """
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """
+    Decode a cursor produced by `encode_cursor`, converting each value to
+    the matching entry in `types`
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise InvalidCursorError("Malformed cursor")
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v) for t, v in zip(types, values)
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+
+def created_before(created_at_col, id_col, cursor: str) -> ColumnElement[bool]:
+    """
+    Build the seek predicate for pages ordered by `(created_at, id)` descending
+    """
+    created_at, row_id = decode_cursor(cursor, datetime, int)
+    return tuple_(created_at_col, id_col) < tuple_(created_at, row_id)
+
+
+def ranked_before(rank_expr, id_col, cursor: str) -> ColumnElement[bool]:
+    """
+    Build the seek predicate for pages ordered by `(rank, id)` descending
+    """
+    rank, row_id = decode_cursor(cursor, float, int)
+    return tuple_(rank_expr, id_col) < tuple_(rank, row_id)
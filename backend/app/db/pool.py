@@ -0,0 +1,26 @@
+"""
+Connection pool with checkout instrumentation
+"""
+from time import perf_counter
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how long each checkout waits for a
+    connection and how many checkouts are waiting right now
+    """
+
+    waiters = 0
+
+    def _do_get(self):
+        start = perf_counter()
+        self.waiters += 1
+        try:
+            return super()._do_get()
+        finally:
+            self.waiters -= 1
+            DB_POOL_CHECKOUT_WAIT.observe(perf_counter() - start)
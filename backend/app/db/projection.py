@@ -0,0 +1,52 @@
+"""
+Sparse fieldsets for list endpoints
+
+`fields=name,company,created_at` (or a preset name such as `summary`)
+selects only those columns in SQL and returns only those keys, so large
+text columns are neither read nor sent unless asked for.
+"""
+from typing import Mapping, Sequence
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+class InvalidFieldsError(ValueError):
+    """
+    Raised when a fields parameter names unknown fields
+    """
+
+
+def parse_fields(
+    value: str | None,
+    allowed: Sequence[str],
+    presets: Mapping[str, Sequence[str]],
+) -> tuple[str, ...]:
+    """
+    Resolve a `fields` parameter to field names in `allowed` order.
+
+    An empty value selects every allowed field; a single preset name
+    expands to that preset.
+    """
+    if not value or not value.strip():
+        return tuple(allowed)
+    value = value.strip()
+    if value in presets:
+        requested = set(presets[value])
+    else:
+        requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise InvalidFieldsError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(allowed)} or one of: {', '.join(presets)}"
+        )
+    return tuple(name for name in allowed if name in requested)
+
+
+def project(model, fields: Sequence[str], *required: str) -> list[InstrumentedAttribute]:
+    """
+    Columns to SELECT for `fields`, plus `required` ones (e.g. the keyset
+    sort key) that the endpoint needs even when they are not returned
+    """
+    names = list(fields) + [name for name in required if name not in fields]
+    return [getattr(model, name) for name in names]
@@ -1,17 +1,80 @@
 """
 Database session configuration
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from app.core.config import settings
+from uuid import uuid4
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
 )
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.pool import InstrumentedAsyncQueuePool
+
+
+def _prepared_statement_name() -> str:
+    # Unique per statement, so a transaction-mode pooler never hands us a
+    # server connection where the name is already taken
+    return f"__asyncpg_{uuid4()}__"
+
+
+def build_engine(mode: str | None = None, url: str | None = None) -> AsyncEngine:
+    """
+    Create the async engine for a deployment mode ("pooled" or "serverless")
+    """
+    mode = mode or settings.DB_MODE
+    url = url or settings.DATABASE_URL
+
+    if mode == "pooled":
+        pool_kwargs = {
+            "poolclass": InstrumentedAsyncQueuePool,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        }
+        connect_args = {}
+    elif mode == "serverless":
+        if settings.DB_SERVERLESS_POOL_SIZE > 0:
+            # A few connections kept by a warm instance; pre-ping catches
+            # the ones dropped while the instance was frozen
+            pool_kwargs = {
+                "poolclass": InstrumentedAsyncQueuePool,
+                "pool_pre_ping": True,
+                "pool_size": settings.DB_SERVERLESS_POOL_SIZE,
+                "max_overflow": 0,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+                "pool_recycle": settings.DB_POOL_RECYCLE,
+            }
+        else:
+            pool_kwargs = {"poolclass": NullPool}
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _prepared_statement_name,
+        }
+    else:
+        raise ValueError(f"Unknown DB_MODE: {mode}")
+
+    engine = create_async_engine(
+        url,
+        echo=False,  # SQL logging is controlled by DB_ECHO in app.core.logging
+        connect_args=connect_args,
+        **pool_kwargs,
+    )
+    # Query count and duration metrics
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+# Created once per process and reused by every request, including across
+# warm serverless invocations
+engine = build_engine()
 
 # Create session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -36,4 +99,3 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
-
@@ -4,18 +4,27 @@ FastAPI main application entry point
 Copyright (c) 2024 Nirvahatech. All rights reserved.
 This software is proprietary and confidential.
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from time import monotonic
 import logging
 
 from app.api.v1.router import api_router
 from app.core.config import settings
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.logging import RequestIdMiddleware, configure_logging
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.core.rate_limit import RateLimit, RateLimitMiddleware
+from app.db.health import database_probe, pool_stats, verify_schema_revision
 from app.db.session import engine
 from app.db.base import Base
+from app.services.lead_queue import LeadIngestionQueue
+from app.services.notifications import NotificationDispatcher
+from app.services.resume_text import ResumeTextExtractor
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging(settings)
 logger = logging.getLogger(__name__)
 
 
@@ -26,25 +35,85 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting up application...")
-    async with engine.begin() as conn:
-        # Create tables if they don't exist
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Database tables created successfully")
+    if settings.DB_STARTUP_CHECK == "create_all":
+        async with engine.begin() as conn:
+            # Create tables if they don't exist
+            await conn.run_sync(Base.metadata.create_all)
+        logger.info("Database tables created successfully")
+    elif settings.DB_STARTUP_CHECK == "revision":
+        revisions = await verify_schema_revision(settings.DB_EXPECTED_REVISION)
+        logger.info("Database schema at revision %s", ", ".join(revisions))
+    elif settings.DB_STARTUP_CHECK != "skip":
+        raise ValueError(f"Unknown DB_STARTUP_CHECK mode: {settings.DB_STARTUP_CHECK}")
+    
+    if settings.LEADS_WRITE_BEHIND:
+        app.state.lead_queue = LeadIngestionQueue.from_settings()
+        app.state.lead_queue.start()
+        logger.info("Write-behind lead ingestion enabled")
+    
+    if settings.RESUME_TEXT_EXTRACTION_ENABLED:
+        app.state.resume_text_extractor = ResumeTextExtractor.from_settings()
+        app.state.resume_text_extractor.start()
+    
+    if settings.NOTIFICATIONS_ENABLED:
+        app.state.notifier = NotificationDispatcher.from_settings()
+        app.state.notifier.start()
+        logger.info("Email notifications enabled via %s:%s", settings.SMTP_HOST, settings.SMTP_PORT)
     
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+    if settings.LEADS_WRITE_BEHIND:
+        # Flush accepted leads before the engine goes away
+        await app.state.lead_queue.stop(settings.LEADS_SHUTDOWN_TIMEOUT_SECONDS)
+    if settings.RESUME_TEXT_EXTRACTION_ENABLED:
+        await app.state.resume_text_extractor.stop(settings.RESUME_TEXT_SHUTDOWN_TIMEOUT_SECONDS)
+    if settings.NOTIFICATIONS_ENABLED:
+        await app.state.notifier.stop(settings.NOTIFICATIONS_SHUTDOWN_TIMEOUT_SECONDS)
     await engine.dispose()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    # The schema is generated on the first request for it, never at startup
+    openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.OPENAPI_ENABLED else None,
     lifespan=lifespan,
 )
 
+# Idempotency-Key replays for create endpoints (inside CORS, so replayed
+# responses get CORS headers for the replaying origin)
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(
+        IdempotencyMiddleware,
+        paths=[f"{settings.API_V1_STR}/leads", f"{settings.API_V1_STR}/applications"],
+        ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+        lock_lease=settings.IDEMPOTENCY_LOCK_SECONDS,
+        wait_timeout=settings.IDEMPOTENCY_WAIT_SECONDS,
+        cache_size=settings.IDEMPOTENCY_CACHE_SIZE,
+    )
+
+# Rate limiting for public submission endpoints (inside CORS, so browsers
+# can read the 429)
+if settings.RATE_LIMIT_ENABLED:
+    leads_limit = RateLimit.per_minute(
+        settings.RATE_LIMIT_LEADS_PER_MINUTE, settings.RATE_LIMIT_LEADS_BURST
+    )
+    app.add_middleware(
+        RateLimitMiddleware,
+        limits={
+            f"{settings.API_V1_STR}/leads": leads_limit,
+            f"{settings.API_V1_STR}/leads/bulk": leads_limit,
+            f"{settings.API_V1_STR}/applications": RateLimit.per_minute(
+                settings.RATE_LIMIT_APPLICATIONS_PER_MINUTE,
+                settings.RATE_LIMIT_APPLICATIONS_BURST,
+            ),
+        },
+        max_entries=settings.RATE_LIMIT_MAX_CLIENTS,
+        trusted_proxy_hops=settings.RATE_LIMIT_TRUSTED_PROXY_HOPS,
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -52,8 +121,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Next-Cursor", "X-Request-ID", "Idempotent-Replayed", "ETag",
+        "Content-Range", "Content-Disposition",
+    ],
 )
 
+# Request latency and per-request query metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Request id for log correlation (outermost, so every log line carries it)
+app.add_middleware(RequestIdMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -69,3 +149,38 @@ async def health_check():
         "version": settings.VERSION
     }
 
+
+@app.get("/ready")
+async def readiness_check(request: Request, response: Response):
+    """
+    Readiness check with a cached database ping and live pool and queue
+    statistics
+    """
+    ping = await database_probe.check()
+    if not ping.ok:
+        response.status_code = 503
+    queues = {}
+    if settings.LEADS_WRITE_BEHIND:
+        queues["leads"] = request.app.state.lead_queue.depth
+    if settings.NOTIFICATIONS_ENABLED:
+        queues["notifications"] = request.app.state.notifier.depth
+    return {
+        "status": "ready" if ping.ok else "unavailable",
+        "database": {
+            "ok": ping.ok,
+            "latency_ms": round(ping.latency_ms, 2),
+            "age_s": round(monotonic() - ping.checked_at, 2),
+            "error": ping.error,
+        },
+        "pool": pool_stats(),
+        "queues": queues,
+    }
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """
+        Prometheus metrics endpoint
+        """
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
@@ -1,5 +1,7 @@
 from app.models.lead import Lead
 from app.models.application import Application
+from app.models.idempotency import IdempotencyKey
+from app.models.lead_stat import LeadStat
+from app.models.resume_text import ResumeText
 
-__all__ = ["Lead", "Application"]
-
+__all__ = ["Lead", "Application", "IdempotencyKey", "LeadStat", "ResumeText"]
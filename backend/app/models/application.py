@@ -1,7 +1,7 @@
 """
 Job Application model
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -19,11 +19,15 @@ class Application(Base):
     phone = Column(String(50), nullable=False)
     linkedin_url = Column(String(500), nullable=True)
     resume_filename = Column(String(500), nullable=False)
-    resume_path = Column(String(1000), nullable=False)
+    resume_path = Column(String(1000), nullable=False, index=True)
     note = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        Index('idx_applications_created_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<Application {self.first_name} {self.last_name} - {self.email}>"
 
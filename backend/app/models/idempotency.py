@@ -0,0 +1,34 @@
+"""
+Idempotency key model
+"""
+from datetime import datetime
+from sqlalchemy import DateTime, LargeBinary, SmallInteger, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Stored response for a request sent with an Idempotency-Key header.
+
+    A row without `status_code` is a claim held by the request still being
+    processed; `expires_at` is then the end of its lease.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(320), primary_key=True)
+    status_code: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    headers: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey(key={self.key}, status_code={self.status_code})>"
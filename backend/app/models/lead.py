@@ -2,10 +2,22 @@
 Lead model
 """
 from datetime import datetime
-from sqlalchemy import String, Text, DateTime, Index
+from sqlalchemy import BigInteger, String, Text, DateTime, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 
+# Text search configuration used for the search vector and queries
+SEARCH_CONFIG = "english"
+
+# Weighted document: company (A) ranks above job title (B) above the
+# project description (C)
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(company, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(job_title, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(project_description, '')), 'C')"
+)
+
 
 class Lead(Base):
     """
@@ -21,6 +33,18 @@ class Lead(Base):
     phone: Mapped[str | None] = mapped_column(String(50), nullable=True)
     project_description: Mapped[str] = mapped_column(Text, nullable=False)
     
+    # Maintained by Postgres; deferred so it is never loaded or returned
+    # unless asked for
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True
+    )
+    
+    # Dedup window number (see app.services.leads); NULL when deduplication
+    # was disabled, which never conflicts
+    dedup_bucket: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         default=datetime.utcnow,
@@ -37,6 +61,9 @@ class Lead(Base):
     __table_args__ = (
         Index('idx_leads_email_created', 'email', 'created_at'),
         Index('idx_leads_company', 'company'),
+        Index('idx_leads_created_id', 'created_at', 'id'),
+        Index('idx_leads_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('uq_leads_email_dedup_bucket', text('lower(email)'), 'dedup_bucket', unique=True),
     )
     
     def __repr__(self) -> str:
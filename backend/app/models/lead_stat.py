@@ -0,0 +1,92 @@
+"""
+Lead rollup model
+"""
+from sqlalchemy import DDL, BigInteger, Index, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+# Rollup dimensions. `total` has a single row with an empty value; `day`
+# values are ISO dates of created_at (UTC).
+DIMENSIONS = ("total", "day", "company", "job_title")
+
+# Net change per rollup key for row versions `changes` (delta, created_at,
+# company, job_title), applied as one upsert. Keys are upserted in sorted
+# order so concurrent writers lock rollup rows in the same order.
+_APPLY_CHANGES = """
+        INSERT INTO lead_stats AS s (dimension, value, leads)
+        SELECT k.dimension, k.value, sum(r.delta)
+        FROM ({changes}) AS r
+        CROSS JOIN LATERAL (VALUES
+            ('total', ''),
+            ('day', to_char(r.created_at, 'YYYY-MM-DD')),
+            ('company', r.company),
+            ('job_title', r.job_title)
+        ) AS k(dimension, value)
+        GROUP BY k.dimension, k.value
+        HAVING sum(r.delta) <> 0
+        ORDER BY k.dimension, k.value
+        ON CONFLICT (dimension, value) DO UPDATE SET leads = s.leads + excluded.leads;"""
+
+_NEW_ROWS = "SELECT 1 AS delta, created_at, company, job_title FROM new_rows"
+_OLD_ROWS = "SELECT -1 AS delta, created_at, company, job_title FROM old_rows"
+
+# Statement-level trigger function on leads. It runs once per statement
+# (a bulk insert is one upsert, not one per row) inside the writing
+# transaction, and sees ON CONFLICT merges as updates, so a merged lead
+# that changed company moves between rollup rows instead of being counted
+# twice.
+ROLLUP_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION lead_stats_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN{_APPLY_CHANGES.format(changes=_NEW_ROWS)}
+    ELSIF TG_OP = 'UPDATE' THEN{_APPLY_CHANGES.format(changes=f"{_NEW_ROWS} UNION ALL {_OLD_ROWS}")}
+    ELSE{_APPLY_CHANGES.format(changes=_OLD_ROWS)}
+    END IF;
+    RETURN NULL;
+END;
+$$"""
+
+ROLLUP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS lead_stats_insert ON leads",
+    "DROP TRIGGER IF EXISTS lead_stats_update ON leads",
+    "DROP TRIGGER IF EXISTS lead_stats_delete ON leads",
+    "CREATE TRIGGER lead_stats_insert AFTER INSERT ON leads "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION lead_stats_apply()",
+    "CREATE TRIGGER lead_stats_update AFTER UPDATE ON leads "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION lead_stats_apply()",
+    "CREATE TRIGGER lead_stats_delete AFTER DELETE ON leads "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION lead_stats_apply()",
+]
+
+# Recomputes every rollup from leads (see app.services.lead_stats)
+REBUILD_ROLLUPS = _APPLY_CHANGES.format(
+    changes="SELECT 1 AS delta, created_at, company, job_title FROM leads"
+).strip()
+
+
+class LeadStat(Base):
+    """
+    Lead count for one value of one dimension, maintained by triggers on
+    leads
+    """
+
+    __tablename__ = "lead_stats"
+
+    dimension: Mapped[str] = mapped_column(String(20), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255), primary_key=True)
+    leads: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (Index("idx_lead_stats_dimension_leads", "dimension", "leads"),)
+
+    def __repr__(self) -> str:
+        return f"<LeadStat(dimension={self.dimension}, value={self.value}, leads={self.leads})>"
+
+
+# create_all creates the triggers too; after the whole metadata, since they
+# span both tables
+for statement in [ROLLUP_FUNCTION, *ROLLUP_TRIGGERS]:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
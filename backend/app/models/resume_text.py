@@ -0,0 +1,61 @@
+"""
+Resume text model
+"""
+from datetime import datetime
+from sqlalchemy import Computed, DateTime, Index, SmallInteger, String, Text, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+# Text search configuration used for the resume vector and queries
+RESUME_SEARCH_CONFIG = "english"
+
+RESUME_VECTOR_EXPRESSION = f"to_tsvector('{RESUME_SEARCH_CONFIG}', coalesce(content, ''))"
+
+# Rows the extraction worker may claim: queued, or claimed by a worker
+# whose lease (next_attempt_at) ran out
+CLAIMABLE_STATUSES = ("pending", "processing")
+
+
+class ResumeText(Base):
+    """
+    Text extracted from a stored resume blob, keyed like the blob itself so
+    identical files are extracted once.
+
+    The table doubles as the extraction work queue: `status` moves from
+    pending (or processing, while claimed) to done, failed or unsupported.
+    """
+
+    __tablename__ = "resume_texts"
+
+    blob_key: Mapped[str] = mapped_column(String(1000), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0)
+    # Earliest next attempt while pending; lease expiry while processing
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+
+    # Maintained by Postgres; deferred so it is never loaded unless asked for
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed(RESUME_VECTOR_EXPRESSION, persisted=True), deferred=True
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    extracted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("idx_resume_texts_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "idx_resume_texts_queue",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('pending', 'processing')"),
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ResumeText(blob_key={self.blob_key}, status={self.status})>"
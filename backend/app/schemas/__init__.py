@@ -1,4 +1,20 @@
-from app.schemas.lead import LeadCreate, LeadResponse
+from app.schemas.lead import (
+    LeadAccepted,
+    LeadBulkItemResult,
+    LeadBulkResponse,
+    LeadCreate,
+    LeadResponse,
+    LeadSearchResult,
+    LeadStats,
+)
 
-__all__ = ["LeadCreate", "LeadResponse"]
+__all__ = [
+    "LeadAccepted",
+    "LeadBulkItemResult",
+    "LeadBulkResponse",
+    "LeadCreate",
+    "LeadResponse",
+    "LeadSearchResult",
+    "LeadStats",
+]
 
@@ -30,3 +30,11 @@ class ApplicationResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
+
+class ApplicationSearchResult(ApplicationResponse):
+    """Schema for a resume full-text search hit"""
+    rank: float = Field(..., description="Relevance score (ts_rank_cd)")
+    headline: str = Field(
+        ...,
+        description="HTML-escaped resume excerpt with matches wrapped in <mark>"
+    )
@@ -1,7 +1,9 @@
 """
 Lead schemas for request/response validation
 """
-from datetime import datetime
+from datetime import date, datetime
+from typing import Any, Literal
+from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field, field_validator
 import re
 
@@ -60,3 +62,67 @@ class LeadResponse(LeadBase):
         "from_attributes": True
     }
 
+
+class LeadAccepted(BaseModel):
+    """
+    Schema for a lead accepted by the write-behind queue
+    """
+    id: UUID = Field(..., description="Client-side reference for the queued lead")
+    status: Literal["accepted"] = "accepted"
+
+
+class LeadBulkItemResult(BaseModel):
+    """
+    Outcome for one item of a bulk submission
+    """
+    index: int = Field(..., description="Position of the item in the submitted batch")
+    id: int | None = Field(None, description="Id of the created or merged lead")
+    merged: bool = Field(False, description="Merged into an existing lead (duplicate email)")
+    errors: list[dict[str, Any]] | None = Field(None, description="Validation errors")
+
+
+class LeadBulkResponse(BaseModel):
+    """
+    Schema for bulk lead ingestion response
+    """
+    created: int
+    merged: int = 0
+    failed: int
+    results: list[LeadBulkItemResult]
+
+
+class LeadSearchResult(LeadResponse):
+    """
+    Schema for a full-text search hit
+    """
+    rank: float = Field(..., description="Relevance score (ts_rank_cd)")
+    headline: str = Field(
+        ...,
+        description="HTML-escaped project description excerpt with matches wrapped in <mark>"
+    )
+
+
+class LeadDayCount(BaseModel):
+    """
+    Leads created on one day (UTC)
+    """
+    day: date
+    leads: int
+
+
+class LeadGroupCount(BaseModel):
+    """
+    Leads for one company or job title
+    """
+    value: str
+    leads: int
+
+
+class LeadStats(BaseModel):
+    """
+    Schema for lead analytics rollups
+    """
+    total: int = Field(..., description="All leads")
+    by_day: list[LeadDayCount] = Field(..., description="Leads per day, oldest first")
+    by_company: list[LeadGroupCount] = Field(..., description="Top companies by lead count")
+    by_job_title: list[LeadGroupCount] = Field(..., description="Top job titles by lead count")
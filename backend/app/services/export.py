@@ -0,0 +1,90 @@
+"""
+Streaming NDJSON/CSV exports
+
+Rows are read through a server-side cursor in fixed-size partitions and
+encoded as they arrive, so memory use does not depend on table size.
+"""
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, Literal
+import csv
+import io
+import json
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from app.db.session import AsyncSessionLocal
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def naive_utc(value: datetime | None) -> datetime | None:
+    """
+    Convert an aware datetime to naive UTC for `timestamp without time zone` columns
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def stream_rows(
+    query: Select,
+    fmt: ExportFormat,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Execute `query` with a server-side cursor and yield encoded chunks.
+
+    The session is opened here rather than taken from `get_db`, because
+    dependency teardown runs before a streaming body is sent.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        columns = list(result.keys())
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            async for partition in result.partitions():
+                for row in partition:
+                    writer.writerow([_encode_value(v) for v in row])
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue().encode()
+        else:
+            async for partition in result.partitions():
+                yield "".join(
+                    json.dumps(
+                        {c: _encode_value(v) for c, v in zip(columns, row)},
+                        separators=(",", ":"),
+                    )
+                    + "\n"
+                    for row in partition
+                ).encode()
+
+
+def export_response(query: Select, fmt: ExportFormat, name: str) -> StreamingResponse:
+    """
+    Build a streaming download response for an export query
+    """
+    extension = "csv" if fmt == "csv" else "ndjson"
+    return StreamingResponse(
+        stream_rows(query, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
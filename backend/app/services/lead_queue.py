@@ -0,0 +1,274 @@
+"""
+Write-behind ingestion queue for contact-form leads
+
+When enabled, POST /leads validates the payload, puts it on a bounded
+in-process queue and returns immediately. A background task started from
+the application lifespan drains the queue in micro-batches, flushing when
+a batch is full or the oldest queued lead has waited `flush_interval`.
+
+A batch that still fails after `max_retries` attempts is appended to a spill
+file (NDJSON, fsynced) instead of being dropped. Spilled leads are replayed
+when the flusher starts and after the next successful flush, so every
+accepted lead is written at least once.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from uuid import UUID, uuid4
+import asyncio
+import json
+import logging
+import os
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.schemas.lead import LeadCreate
+from app.services.leads import insert_leads
+
+logger = logging.getLogger(__name__)
+
+
+class LeadQueueFullError(Exception):
+    """
+    Raised when a lead cannot be queued before the enqueue timeout
+    """
+
+
+@dataclass
+class QueuedLead:
+    """
+    A validated lead waiting to be written
+    """
+
+    lead: LeadCreate
+    id: UUID = field(default_factory=uuid4)
+
+
+class SpillFile:
+    """
+    Append-only NDJSON file of queued leads that could not be written.
+    Only touched by the flusher, one call at a time (blocking I/O).
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def append(self, items: list[QueuedLead]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(_spill_line(item) for item in items)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read(self) -> list[QueuedLead]:
+        if not self.path.exists():
+            return []
+        items = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    items.append(
+                        QueuedLead(lead=LeadCreate(**record["lead"]), id=UUID(record["id"]))
+                    )
+                except (ValueError, KeyError, TypeError):
+                    # A line cut short by a crash mid-append
+                    logger.error("Skipping unreadable spilled lead: %r", line)
+        return items
+
+    def replace(self, items: list[QueuedLead]) -> None:
+        """
+        Atomically rewrite the file with `items`, removing it when empty
+        """
+        if not items:
+            self.path.unlink(missing_ok=True)
+            return
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(_spill_line(item) for item in items)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+def _spill_line(item: QueuedLead) -> str:
+    return json.dumps({"id": str(item.id), "lead": item.lead.model_dump(mode="json")}) + "\n"
+
+
+class LeadIngestionQueue:
+    """
+    Bounded buffer of leads flushed to the database in micro-batches
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+        enqueue_timeout: float,
+        max_retries: int,
+        spill_path: Path,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self.spill = SpillFile(spill_path)
+        self._queue: asyncio.Queue[QueuedLead] = asyncio.Queue(maxsize=max_size)
+        self._task: asyncio.Task | None = None
+        self._in_flight: list[QueuedLead] = []
+        self._closed = False
+
+    @classmethod
+    def from_settings(cls) -> "LeadIngestionQueue":
+        return cls(
+            max_size=settings.LEADS_QUEUE_MAX_SIZE,
+            batch_size=settings.LEADS_FLUSH_BATCH_SIZE,
+            flush_interval=settings.LEADS_FLUSH_INTERVAL_SECONDS,
+            enqueue_timeout=settings.LEADS_ENQUEUE_TIMEOUT_SECONDS,
+            max_retries=settings.LEADS_FLUSH_MAX_RETRIES,
+            spill_path=Path(settings.LEADS_SPILL_FILE),
+        )
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(self, lead: LeadCreate) -> UUID:
+        """
+        Queue a lead, waiting up to `enqueue_timeout` for space.
+
+        Raises LeadQueueFullError when the buffer stays full (backpressure)
+        or the queue is shutting down.
+        """
+        if self._closed:
+            raise LeadQueueFullError("Lead queue is shutting down")
+        item = QueuedLead(lead=lead)
+        try:
+            await asyncio.wait_for(self._queue.put(item), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            raise LeadQueueFullError("Lead queue is full")
+        return item.id
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="lead-queue-flusher")
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Stop accepting leads and flush everything already accepted
+        """
+        self._closed = True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error("Lead queue did not drain within %ss", timeout)
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        # Anything the flusher did not get to gets one last attempt
+        leftover = list(self._in_flight)
+        while not self._queue.empty():
+            leftover.append(self._queue.get_nowait())
+        if leftover and not await self._flush(leftover, retries=1):
+            await self._spill(leftover)
+
+    async def _run(self) -> None:
+        spilled = await asyncio.to_thread(self.spill.exists)
+        if spilled:
+            spilled = await self._replay_spilled()
+        while True:
+            batch = await self._next_batch()
+            if await self._flush(batch, retries=self.max_retries):
+                if spilled:
+                    # The database is back; retry what was spilled meanwhile
+                    spilled = await self._replay_spilled()
+            else:
+                await self._spill(batch)
+                spilled = True
+            self._in_flight = []
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _next_batch(self) -> list[QueuedLead]:
+        # Gathered in place so stop() finds items taken before a cancellation
+        loop = asyncio.get_running_loop()
+        batch = self._in_flight = [await self._queue.get()]
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: list[QueuedLead], retries: int) -> bool:
+        """
+        Write `batch`, retrying with backoff. Returns False if every attempt failed.
+        """
+        for attempt in range(1, retries + 1):
+            try:
+                async with AsyncSessionLocal() as session:
+                    outcomes = await insert_leads(session, [item.lead for item in batch])
+                    await session.commit()
+                created = sum(1 for _, inserted in outcomes if inserted)
+                logger.info("Flushed %d queued leads (%d merged)", len(batch), len(batch) - created)
+                return True
+            except Exception as e:
+                logger.warning(
+                    "Flushing %d queued leads failed (attempt %d/%d): %s",
+                    len(batch),
+                    attempt,
+                    retries,
+                    e,
+                )
+                if attempt < retries:
+                    await asyncio.sleep(min(2**attempt * 0.1, 5.0))
+        return False
+
+    async def _spill(self, batch: list[QueuedLead]) -> None:
+        try:
+            await asyncio.to_thread(self.spill.append, batch)
+        except OSError as e:
+            # Last resort: log the payloads so they can be replayed through
+            # POST /leads/bulk
+            logger.error("Spilling %d queued leads failed: %s", len(batch), e)
+            for item in batch:
+                logger.error("Dropped queued lead %s: %s", item.id, item.lead.model_dump_json())
+            return
+        logger.error("Spilled %d queued leads to %s", len(batch), self.spill.path)
+
+    async def _replay_spilled(self) -> bool:
+        """
+        Write spilled leads, keeping whatever still fails in the spill file.
+        Returns whether any remain.
+        """
+        items = await asyncio.to_thread(self.spill.read)
+        remaining: list[QueuedLead] = []
+        for start in range(0, len(items), self.batch_size):
+            chunk = items[start : start + self.batch_size]
+            # After one failure keep the rest for later instead of hammering
+            if remaining or not await self._flush(chunk, retries=1):
+                remaining.extend(chunk)
+        await asyncio.to_thread(self.spill.replace, remaining)
+        if items:
+            logger.info("Replayed %d spilled leads", len(items) - len(remaining))
+        return bool(remaining)
+
+
+def get_lead_queue(request: Request) -> LeadIngestionQueue | None:
+    """
+    Dependency returning the write-behind queue, or None when disabled
+    """
+    return getattr(request.app.state, "lead_queue", None)
@@ -0,0 +1,81 @@
+"""
+Lead analytics served from the `lead_stats` rollup table
+
+Triggers on `leads` keep the rollups current in the same transaction as
+every write, so reads never aggregate over `leads` itself: a stats request
+reads at most `days + 2 * top + 1` small rows, however large the table
+grows. `rebuild_lead_stats` recomputes everything from `leads`, for
+backfills and after bulk maintenance done with the triggers disabled.
+"""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lead_stat import REBUILD_ROLLUPS, LeadStat
+from app.schemas.lead import LeadDayCount, LeadGroupCount, LeadStats
+
+
+def _top(dimension: str, limit: int):
+    return (
+        select(LeadStat.dimension, LeadStat.value, LeadStat.leads)
+        .where(LeadStat.dimension == dimension, LeadStat.leads > 0)
+        .order_by(LeadStat.leads.desc(), LeadStat.value)
+        .limit(limit)
+    )
+
+
+async def get_lead_stats(db: AsyncSession, days: int, top: int) -> LeadStats:
+    """
+    Lead totals, per-day counts for the last `days` days (UTC, including
+    today, zero-filled) and the `top` companies and job titles, in one
+    query
+    """
+    today = datetime.utcnow().date()
+    since = today - timedelta(days=days - 1)
+    query = union_all(
+        select(LeadStat.dimension, LeadStat.value, LeadStat.leads).where(
+            LeadStat.dimension == "total"
+        ),
+        select(LeadStat.dimension, LeadStat.value, LeadStat.leads).where(
+            LeadStat.dimension == "day", LeadStat.value >= since.isoformat()
+        ),
+        _top("company", top).subquery().select(),
+        _top("job_title", top).subquery().select(),
+    )
+    rows = (await db.execute(query)).all()
+
+    total = 0
+    per_day: dict[date, int] = {}
+    groups: dict[str, list[LeadGroupCount]] = {"company": [], "job_title": []}
+    for dimension, value, leads in rows:
+        if dimension == "total":
+            total = leads
+        elif dimension == "day":
+            per_day[date.fromisoformat(value)] = leads
+        else:
+            groups[dimension].append(LeadGroupCount(value=value, leads=leads))
+
+    by_day = [
+        LeadDayCount(day=day, leads=per_day.get(day, 0))
+        for day in (since + timedelta(days=offset) for offset in range(days))
+    ]
+    return LeadStats(
+        total=total,
+        by_day=by_day,
+        by_company=groups["company"],
+        by_job_title=groups["job_title"],
+    )
+
+
+async def rebuild_lead_stats(db: AsyncSession) -> int:
+    """
+    Recompute all rollups from `leads` in the current transaction.
+
+    Lead writes block until the transaction ends (reads do not), so no write
+    is counted twice or missed. Returns the number of rollup rows.
+    """
+    await db.execute(text("LOCK TABLE leads IN SHARE MODE"))
+    await db.execute(delete(LeadStat))
+    result = await db.execute(text(REBUILD_ROLLUPS))
+    return result.rowcount
@@ -0,0 +1,112 @@
+"""
+Lead persistence helpers shared by the single, bulk and queued write paths
+
+Writes are upserts against the unique index on (lower(email),
+dedup_bucket): a repeat submission from the same address within the same
+dedup window merges into the existing lead in the same statement instead
+of inserting a new row. `xmax = 0` in RETURNING tells the two outcomes
+apart, because only a freshly inserted row version has no updating
+transaction.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import func, insert, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.lead import Lead
+from app.schemas.lead import LeadCreate
+
+# Inferred by ON CONFLICT; must match uq_leads_email_dedup_bucket
+DEDUP_INDEX_ELEMENTS = [text("lower(email)"), Lead.dedup_bucket]
+
+INSERTED = literal_column("xmax = 0").label("inserted")
+
+
+def dedup_bucket(at: datetime) -> int | None:
+    """
+    Dedup window number for a naive UTC timestamp, or None when
+    deduplication is disabled (NULLs never conflict)
+    """
+    window = settings.LEADS_DEDUP_WINDOW_SECONDS
+    if window <= 0:
+        return None
+    return int(at.replace(tzinfo=timezone.utc).timestamp() // window)
+
+
+def _upsert():
+    stmt = pg_insert(Lead)
+    # Latest submission wins, but a missing phone does not erase a known one;
+    # created_at keeps the first submission's time
+    return stmt.on_conflict_do_update(
+        index_elements=DEDUP_INDEX_ELEMENTS,
+        set_={
+            "name": stmt.excluded.name,
+            "company": stmt.excluded.company,
+            "job_title": stmt.excluded.job_title,
+            "phone": func.coalesce(stmt.excluded.phone, Lead.phone),
+            "project_description": stmt.excluded.project_description,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+
+
+def _row(lead: LeadCreate, now: datetime) -> dict:
+    return {
+        **lead.model_dump(),
+        "created_at": now,
+        "updated_at": now,
+        "dedup_bucket": dedup_bucket(now),
+    }
+
+
+async def upsert_lead(db: AsyncSession, lead: LeadCreate) -> tuple[Lead, bool]:
+    """
+    Insert a lead or merge it into a duplicate from the current window.
+
+    Returns the stored lead and whether a new row was inserted.
+    """
+    row = _row(lead, datetime.utcnow())
+    result = await db.execute(_upsert().values(**row).returning(Lead, INSERTED))
+    db_lead, inserted = result.one()
+    return db_lead, inserted
+
+
+async def insert_leads(db: AsyncSession, leads: list[LeadCreate]) -> list[tuple[int, bool]]:
+    """
+    Upsert many leads with multi-row INSERT ... ON CONFLICT ... RETURNING
+    statements.
+
+    A statement may not touch the same row twice, so duplicates within the
+    batch are collapsed first (the last one wins, as if submitted in
+    order). Returns `(id, inserted)` in input order; collapsed duplicates
+    report the id of the row they merged into and `inserted=False`.
+    """
+    if not leads:
+        return []
+
+    now = datetime.utcnow()
+    if dedup_bucket(now) is None:
+        rows = [_row(lead, now) for lead in leads]
+        result = await db.execute(
+            insert(Lead).returning(Lead.id, sort_by_parameter_order=True), rows
+        )
+        return [(lead_id, True) for lead_id in result.scalars()]
+
+    # All rows share one bucket, so the address alone identifies duplicates
+    rows_by_email = {lead.email.lower(): _row(lead, now) for lead in leads}
+    result = await db.execute(
+        _upsert().returning(Lead.id, Lead.email, INSERTED),
+        list(rows_by_email.values()),
+    )
+    written = {row.email.lower(): (row.id, row.inserted) for row in result}
+
+    outcomes = []
+    seen: set[str] = set()
+    for lead in leads:
+        key = lead.email.lower()
+        lead_id, inserted = written[key]
+        outcomes.append((lead_id, inserted and key not in seen))
+        seen.add(key)
+    return outcomes
@@ -0,0 +1,172 @@
+"""
+Conditional GET caching for list endpoints
+
+Every table has an in-process generation counter. It is bumped when a
+session that wrote to the table commits. Cached list responses are keyed
+by the table's generation and the request's query parameters, so any
+committed write invalidates them and an idle dashboard poll is answered
+from memory without a database query. The ETag is a hash of the body, so
+it is the same on every worker, and a matching `If-None-Match` gets
+`304 Not Modified`.
+
+Writes made by other worker processes do not bump this process's
+counters. Entries therefore also expire after a short TTL, which bounds
+how stale a cached list can be.
+"""
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from hashlib import blake2b
+from time import monotonic
+from typing import Any, Iterable
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import settings
+from app.core.responses import dumps
+
+_generations: defaultdict[str, int] = defaultdict(int)
+
+
+def table_generation(table: str) -> int:
+    return _generations[table]
+
+
+def bump_generations(tables: Iterable[str]) -> None:
+    for table in tables:
+        _generations[table] += 1
+
+
+def _written_tables(session: Session) -> set[str]:
+    return session.info.setdefault("written_tables", set())
+
+
+def mark_written(session: Session | AsyncSession, *tables: str) -> None:
+    """
+    Record writes the hooks below cannot see, such as DML inside a CTE of a
+    SELECT, so the tables' generations are bumped when `session` commits
+    """
+    session.info.setdefault("written_tables", set()).update(tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(state: ORMExecuteState) -> None:
+    # INSERT/UPDATE/DELETE statements run through session.execute()
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None:
+            _written_tables(state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush_writes(session: Session, flush_context) -> None:
+    # Objects written by the unit of work
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        _written_tables(session).add(obj.__table__.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session: Session) -> None:
+    bump_generations(session.info.pop("written_tables", ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("written_tables", None)
+
+
+@dataclass
+class CachedList:
+    """
+    A rendered list response
+    """
+
+    body: bytes
+    etag: str
+    headers: dict[str, str]
+    expires_at: float
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+class ListCache:
+    """
+    Bounded LRU of rendered list responses
+    """
+
+    def __init__(self, max_entries: int, ttl: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: OrderedDict[str, CachedList] = OrderedDict()
+
+    def key(self, table: str, request: Request) -> str:
+        """
+        Cache key for a request against the current generation of `table`.
+
+        Take the key before querying: a write committed while the query runs
+        then lands in a newer generation instead of being masked.
+        """
+        params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{table}:{table_generation(table)}:{request.url.path}?{params}"
+
+    def get(self, key: str, request: Request) -> Response | None:
+        """
+        Serve a cached response (or 304) for `key`, if there is a fresh one
+        """
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return self._respond(entry, request)
+
+    def put(
+        self,
+        key: str,
+        request: Request,
+        content: Any,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """
+        Render `content` (plain data, see app.core.responses) as JSON, cache
+        it under `key` and return the response
+        """
+        body = dumps(content)
+        entry = CachedList(
+            body=body,
+            etag=f'"{blake2b(body, digest_size=12).hexdigest()}"',
+            headers=headers or {},
+            expires_at=monotonic() + self.ttl,
+        )
+        if self.enabled:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return self._respond(entry, request)
+
+    def _respond(self, entry: CachedList, request: Request) -> Response:
+        headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request, entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+
+list_cache = ListCache(
+    max_entries=settings.LIST_CACHE_MAX_ENTRIES,
+    ttl=settings.LIST_CACHE_TTL_SECONDS,
+    enabled=settings.LIST_CACHE_ENABLED,
+)
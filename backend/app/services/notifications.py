@@ -0,0 +1,336 @@
+"""
+Acknowledgement emails sent off the request path
+
+Endpoints hand a message to `NotificationDispatcher.enqueue`, which never
+blocks: it puts the message on a bounded in-process queue, or drops it
+when the queue is full. A fixed number of sender tasks drain the queue.
+Each owns one persistent SMTP connection and sends up to `batch_size`
+queued messages per connection use, in a worker thread (smtplib is
+blocking). Failed sends are retried with exponential backoff; permanent
+rejections (5xx) are not.
+"""
+from dataclasses import dataclass
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+import asyncio
+import logging
+import random
+import smtplib
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.metrics import NOTIFICATION_QUEUE_DEPTH, NOTIFICATIONS
+
+logger = logging.getLogger(__name__)
+
+# Backoff before retry n is BACKOFF_BASE * 2**(n - 1) seconds, capped
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+
+@dataclass
+class Notification:
+    """
+    An email waiting to be sent
+    """
+
+    message: EmailMessage
+    attempts: int = 0
+
+
+def _permanent(error: Exception) -> bool:
+    # 5xx replies will not succeed on retry; 4xx and connection errors may
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class SMTPConnection:
+    """
+    A lazily opened SMTP session reused across sends. Only ever used from
+    one worker thread at a time.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        starttls: bool,
+        timeout: float,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._smtp: smtplib.SMTP | None = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def send_batch(self, batch: list[Notification]) -> list[tuple[Notification, Exception]]:
+        """
+        Send `batch` over this connection, reconnecting once if the server
+        dropped it while idle. Returns the messages that failed.
+        """
+        failures = []
+        for index, item in enumerate(batch):
+            try:
+                self._send(item.message)
+            except (
+                smtplib.SMTPRecipientsRefused,
+                smtplib.SMTPSenderRefused,
+                smtplib.SMTPDataError,
+            ) as e:
+                # This message was rejected; the session is still usable
+                failures.append((item, e))
+            except OSError as e:
+                # Connection, TLS or login failure (SMTPException is an
+                # OSError): this and every later message fail
+                self.close()
+                failures.extend((rest, e) for rest in batch[index:])
+                break
+        return failures
+
+    def _send(self, message: EmailMessage) -> None:
+        if self._smtp is None:
+            self._smtp = self._connect()
+        else:
+            try:
+                self._smtp.send_message(message)
+                return
+            except smtplib.SMTPServerDisconnected:
+                # Idle connections get closed by servers; one fresh attempt
+                self.close()
+                self._smtp = self._connect()
+        self._smtp.send_message(message)
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        smtp, self._smtp = self._smtp, None
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+
+class NotificationDispatcher:
+    """
+    Bounded queue of emails drained by `connections` sender tasks
+    """
+
+    def __init__(
+        self,
+        connections: list[SMTPConnection],
+        max_size: int,
+        batch_size: int,
+        batch_interval: float,
+        max_retries: int,
+        idle_timeout: float,
+    ):
+        self.connections = connections
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.max_retries = max_retries
+        self.idle_timeout = idle_timeout
+        self._queue: asyncio.Queue[Notification] = asyncio.Queue(maxsize=max_size)
+        self._tasks: list[asyncio.Task] = []
+        self._retries: set[asyncio.Task] = set()
+        self._closed = False
+
+    @classmethod
+    def from_settings(cls) -> "NotificationDispatcher":
+        connections = [
+            SMTPConnection(
+                host=settings.SMTP_HOST,
+                port=settings.SMTP_PORT,
+                username=settings.SMTP_USER,
+                password=settings.SMTP_PASSWORD,
+                starttls=settings.SMTP_STARTTLS,
+                timeout=settings.SMTP_TIMEOUT_SECONDS,
+            )
+            for _ in range(settings.NOTIFICATIONS_SMTP_CONNECTIONS)
+        ]
+        return cls(
+            connections=connections,
+            max_size=settings.NOTIFICATIONS_QUEUE_MAX_SIZE,
+            batch_size=settings.NOTIFICATIONS_BATCH_SIZE,
+            batch_interval=settings.NOTIFICATIONS_BATCH_INTERVAL_SECONDS,
+            max_retries=settings.NOTIFICATIONS_MAX_RETRIES,
+            idle_timeout=settings.NOTIFICATIONS_IDLE_SECONDS,
+        )
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def retrying(self) -> int:
+        return len(self._retries)
+
+    def enqueue(self, message: EmailMessage) -> bool:
+        """
+        Queue `message` without waiting. Returns False (and drops it) when
+        the queue is full or shutting down.
+        """
+        return self._put(Notification(message))
+
+    def _put(self, item: Notification) -> bool:
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            NOTIFICATIONS.inc(1, "dropped")
+            logger.warning("Notification queue full, dropping email to %s", item.message["To"])
+            return False
+        return True
+
+    def start(self) -> None:
+        NOTIFICATION_QUEUE_DEPTH.set_function(lambda: self.depth)
+        self._tasks = [
+            asyncio.create_task(self._run(connection), name=f"notification-sender-{index}")
+            for index, connection in enumerate(self.connections)
+        ]
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Stop accepting messages, send what is queued and close connections.
+        Messages waiting for a retry are abandoned.
+        """
+        self._closed = True
+        if self._retries:
+            logger.warning("Abandoning %d emails waiting for a retry", len(self._retries))
+        for task in self._retries:
+            task.cancel()
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                "Notification queue did not drain within %ss (%d left)", timeout, self.depth
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for connection in self.connections:
+            await asyncio.to_thread(connection.close)
+        NOTIFICATION_QUEUE_DEPTH.set_function(None)
+
+    async def _run(self, connection: SMTPConnection) -> None:
+        while True:
+            try:
+                first = await asyncio.wait_for(self._queue.get(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                # Release the server's connection slot while nothing is sent
+                await asyncio.to_thread(connection.close)
+                continue
+            batch = await self._fill_batch(first)
+            try:
+                failures = await asyncio.to_thread(connection.send_batch, batch)
+            except Exception as e:
+                logger.exception("Unexpected error sending %d emails", len(batch))
+                await asyncio.to_thread(connection.close)
+                failures = [(item, e) for item in batch]
+            NOTIFICATIONS.inc(len(batch) - len(failures), "sent")
+            for item, error in failures:
+                self._retry(item, error)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _fill_batch(self, first: Notification) -> list[Notification]:
+        loop = asyncio.get_running_loop()
+        batch = [first]
+        deadline = loop.time() + self.batch_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _retry(self, item: Notification, error: Exception) -> None:
+        item.attempts += 1
+        recipient = item.message["To"]
+        if _permanent(error) or item.attempts > self.max_retries or self._closed:
+            NOTIFICATIONS.inc(1, "failed")
+            logger.error(
+                "Giving up on email to %s after %d attempt(s): %s", recipient, item.attempts, error
+            )
+            return
+        delay = min(BACKOFF_BASE * 2 ** (item.attempts - 1), BACKOFF_MAX)
+        delay *= random.uniform(0.5, 1.0)
+        NOTIFICATIONS.inc(1, "retried")
+        logger.warning(
+            "Email to %s failed (attempt %d/%d), retrying in %.1fs: %s",
+            recipient,
+            item.attempts,
+            self.max_retries + 1,
+            delay,
+            error,
+        )
+        task = asyncio.create_task(self._requeue_later(item, delay))
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    async def _requeue_later(self, item: Notification, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._put(item)
+
+
+def _message(to: str, subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr((settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL))
+    message["To"] = to
+    message["Subject"] = subject
+    # Fixed up front, so a retried send is recognisable as the same email
+    message["Message-ID"] = make_msgid(domain=settings.EMAILS_FROM_EMAIL.rpartition("@")[2])
+    message.set_content(body)
+    return message
+
+
+def lead_acknowledgement(name: str, email: str) -> EmailMessage:
+    return _message(
+        email,
+        f"Thanks for contacting {settings.EMAILS_FROM_NAME}",
+        f"Hi {name},\n\n"
+        "Thanks for reaching out. We have received your message and will get back "
+        "to you shortly.\n\n"
+        f"The {settings.EMAILS_FROM_NAME} team\n",
+    )
+
+
+def application_acknowledgement(first_name: str, email: str) -> EmailMessage:
+    return _message(
+        email,
+        "We received your application",
+        f"Hi {first_name},\n\n"
+        "Thanks for applying. We have received your application and resume and "
+        "will be in touch after reviewing them.\n\n"
+        f"The {settings.EMAILS_FROM_NAME} team\n",
+    )
+
+
+def get_notifier(request: Request) -> NotificationDispatcher | None:
+    """
+    Dependency returning the notification dispatcher, or None when disabled
+    """
+    return getattr(request.app.state, "notifier", None)
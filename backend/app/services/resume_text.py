@@ -0,0 +1,310 @@
+"""
+Background resume text extraction
+
+Stored resumes are queued in `resume_texts` (one row per blob) in the same
+transaction that creates the application. An extractor task started from
+the application lifespan claims queued rows with `FOR UPDATE SKIP LOCKED`,
+so any number of workers can share the queue. It reads each blob from
+storage and parses it in a process pool, so CPU-bound parsing never runs
+on the event loop. Failed extractions are retried with backoff up to
+`max_attempts`; formats that cannot be parsed are marked unsupported.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+import asyncio
+import logging
+import multiprocessing
+
+from fastapi import Request
+from sqlalchemy import Insert, Select, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.application import Application
+from app.models.resume_text import CLAIMABLE_STATUSES, ResumeText
+from app.services.storage import ResumeStorage, get_resume_storage
+from app.services.text_extraction import UnsupportedFormatError, extract_text
+
+logger = logging.getLogger(__name__)
+
+# Retry n waits RETRY_BACKOFF * 4**(n - 1) seconds
+RETRY_BACKOFF = 30.0
+# Worker processes are replaced after this many files, bounding parser leaks
+TASKS_PER_PROCESS = 100
+
+
+def queue_resume_texts(keys: Select) -> Insert:
+    """
+    INSERT queueing the blob keys selected by `keys` for extraction; blobs
+    already queued or extracted are left alone. Usable as a CTE, so a new
+    application and its queue row are written in one statement.
+    """
+    # Column defaults are spelled out: Python-side defaults are not applied
+    # to an INSERT nested in a CTE
+    rows = keys.add_columns(literal("pending"), literal(0))
+    return (
+        pg_insert(ResumeText)
+        .from_select(["blob_key", "status", "attempts"], rows)
+        .on_conflict_do_nothing()
+    )
+
+
+async def queue_missing(db: AsyncSession) -> int:
+    """
+    Queue every stored resume that has no extraction row yet (backfill)
+    """
+    result = await db.execute(queue_resume_texts(select(Application.resume_path).distinct()))
+    return result.rowcount
+
+
+async def requeue_failed(db: AsyncSession) -> int:
+    """
+    Give failed extractions, and claims abandoned at the attempt limit, a
+    fresh set of attempts
+    """
+    result = await db.execute(
+        update(ResumeText)
+        .where(
+            or_(
+                ResumeText.status == "failed",
+                (ResumeText.status == "processing") & (ResumeText.next_attempt_at < func.now()),
+            )
+        )
+        .values(status="pending", attempts=0, next_attempt_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+class ResumeTextExtractor:
+    """
+    Drains the `resume_texts` queue through a process pool
+    """
+
+    def __init__(
+        self,
+        storage: ResumeStorage,
+        workers: int,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        max_chars: int,
+        timeout: float,
+    ):
+        self.storage = storage
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.max_chars = max_chars
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    @classmethod
+    def from_settings(cls) -> "ResumeTextExtractor":
+        return cls(
+            storage=get_resume_storage(),
+            workers=settings.RESUME_TEXT_WORKERS,
+            batch_size=settings.RESUME_TEXT_BATCH_SIZE,
+            poll_interval=settings.RESUME_TEXT_POLL_SECONDS,
+            max_attempts=settings.RESUME_TEXT_MAX_ATTEMPTS,
+            max_chars=settings.RESUME_TEXT_MAX_CHARS,
+            timeout=settings.RESUME_TEXT_TIMEOUT_SECONDS,
+        )
+
+    def notify(self) -> None:
+        """
+        Wake the extractor after queueing work
+        """
+        self._wake.set()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="resume-text-extractor")
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Stop claiming work and let the current pass finish for up to
+        `timeout` seconds. Rows it does not finish return to the queue when
+        their lease runs out.
+        """
+        self._stopping = True
+        self._wake.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout)
+            except asyncio.TimeoutError:
+                logger.error("Resume text extraction pass did not finish within %ss", timeout)
+                self._task.cancel()
+                await asyncio.gather(self._task, return_exceptions=True)
+        self._shutdown_executor(terminate=True)
+
+    async def drain(self) -> int:
+        """
+        Process queued rows until none are due; returns how many were processed
+        """
+        processed = 0
+        try:
+            while count := await self.run_once():
+                processed += count
+        finally:
+            self._shutdown_executor()
+        return processed
+
+    async def _run(self) -> None:
+        # Exits through the stop flag rather than cancellation, which an
+        # idle wait racing with notify() can swallow
+        while not self._stopping:
+            # Cleared before claiming, so work queued during a pass wakes the next one
+            self._wake.clear()
+            try:
+                if await self.run_once() == self.batch_size:
+                    continue
+            except Exception:
+                logger.exception("Resume text extraction pass failed")
+            if self._stopping:
+                break
+            try:
+                async with asyncio.timeout(self.poll_interval):
+                    await self._wake.wait()
+            except TimeoutError:
+                pass
+
+    async def run_once(self) -> int:
+        """
+        Claim and process one batch of due rows
+        """
+        claimed = await self._claim()
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def process(blob_key: str, attempt: int) -> None:
+            async with semaphore:
+                await self._process(blob_key, attempt)
+
+        await asyncio.gather(*(process(key, attempt) for key, attempt in claimed))
+        return len(claimed)
+
+    async def _claim(self) -> list[tuple[str, int]]:
+        due = (
+            select(ResumeText.blob_key)
+            .where(
+                ResumeText.status.in_(CLAIMABLE_STATUSES),
+                ResumeText.next_attempt_at <= func.now(),
+                ResumeText.attempts < self.max_attempts,
+            )
+            .order_by(ResumeText.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        # The lease covers queueing behind the rest of the batch
+        lease = timedelta(seconds=self.timeout * (self.batch_size // self.workers + 1))
+        stmt = (
+            update(ResumeText)
+            .where(ResumeText.blob_key.in_(due.scalar_subquery()))
+            .values(
+                status="processing",
+                attempts=ResumeText.attempts + 1,
+                next_attempt_at=func.now() + lease,
+            )
+            .returning(ResumeText.blob_key, ResumeText.attempts)
+            .execution_options(synchronize_session=False)
+        )
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(stmt)).all()
+            await session.commit()
+        return [(row.blob_key, row.attempts) for row in rows]
+
+    async def _process(self, blob_key: str, attempt: int) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            data = await self.storage.read(blob_key)
+            text = await asyncio.wait_for(
+                loop.run_in_executor(self._pool(), extract_text, data, self.max_chars),
+                self.timeout,
+            )
+        except UnsupportedFormatError as e:
+            await self._finish(blob_key, status="unsupported", error=str(e))
+            return
+        except asyncio.TimeoutError:
+            # The worker is stuck on this file; replace the pool
+            self._shutdown_executor(terminate=True)
+            error = f"Timed out after {self.timeout}s"
+        except BrokenProcessPool:
+            self._shutdown_executor(terminate=True)
+            error = "Extraction process died"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            await self._finish(blob_key, status="done", content=text)
+            return
+
+        if attempt >= self.max_attempts:
+            logger.error("Giving up on resume %s after %d attempts: %s", blob_key, attempt, error)
+            await self._finish(blob_key, status="failed", error=error)
+            return
+        delay = timedelta(seconds=RETRY_BACKOFF * 4 ** (attempt - 1))
+        logger.warning(
+            "Extracting resume %s failed (attempt %d/%d), retrying in %ss: %s",
+            blob_key,
+            attempt,
+            self.max_attempts,
+            delay.total_seconds(),
+            error,
+        )
+        await self._finish(blob_key, status="pending", error=error, retry_in=delay)
+
+    async def _finish(
+        self,
+        blob_key: str,
+        status: str,
+        content: str | None = None,
+        error: str | None = None,
+        retry_in: timedelta | None = None,
+    ) -> None:
+        values = {"status": status, "content": content, "error": error}
+        if status == "done":
+            values["extracted_at"] = func.now()
+        if retry_in is not None:
+            values["next_attempt_at"] = func.now() + retry_in
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(ResumeText)
+                .where(ResumeText.blob_key == blob_key)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Spawned rather than forked: the parent runs an event loop and
+        # threads, and children only need app.services.text_extraction
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=TASKS_PER_PROCESS,
+            )
+        return self._executor
+
+    def _shutdown_executor(self, terminate: bool = False) -> None:
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        if terminate:
+            # A hung parser never returns; shutdown() alone would leave it
+            # running
+            for process in list(getattr(executor, "_processes", {}).values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_resume_text_extractor(request: Request) -> ResumeTextExtractor | None:
+    """
+    Dependency returning the in-process extractor, or None when disabled
+    """
+    return getattr(request.app.state, "resume_text_extractor", None)
@@ -0,0 +1,314 @@
+"""
+Content-addressed resume storage
+
+Blobs are stored under their SHA-256 in a sharded key space
+(`ab/cd/abcd...`), so identical files are written once and no directory
+grows beyond a few hundred entries. `Application.resume_path` holds the
+blob key; the number of applications pointing at a key is its reference
+count. Rows written before this layout hold a file path relative to the
+working directory instead; `blob_sha256` tells the two apart.
+
+Storing a blob and releasing it both take a transaction-level advisory lock
+on its key (`lock_blob`), so a blob is never deleted between another
+request finding it already stored and committing its reference.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import quote
+import asyncio
+import logging
+import os
+import re
+import tempfile
+
+from fastapi import UploadFile
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.application import Application
+from app.services.upload_validation import FormatValidator
+from app.services.uploads import spool_upload
+
+logger = logging.getLogger(__name__)
+
+BLOB_KEY_PATTERN = re.compile(r"[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})")
+# Lifetime of presigned download URLs
+DOWNLOAD_URL_TTL_SECONDS = 300
+
+
+def blob_key(sha256: str) -> str:
+    """
+    Build the sharded storage key for a SHA-256 hex digest
+    """
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+def blob_sha256(key: str) -> str | None:
+    """
+    SHA-256 of the content stored under a blob key. None for legacy keys:
+    paths relative to the working directory, written before content-addressed
+    storage.
+    """
+    match = BLOB_KEY_PATTERN.fullmatch(key)
+    return match.group(1) if match else None
+
+
+@dataclass
+class StoredBlob:
+    """
+    Result of storing a resume blob
+    """
+
+    key: str
+    size: int
+    sha256: str
+    created: bool
+
+
+class ResumeStorage(ABC):
+    """
+    Base class for resume storage backends
+    """
+
+    @abstractmethod
+    async def save(
+        self,
+        db: AsyncSession,
+        upload: UploadFile,
+        max_size: int,
+        validator: FormatValidator | None = None,
+    ) -> StoredBlob:
+        """
+        Stream an upload into storage, skipping the write if the blob exists.
+        Content rejected by `validator` is never stored.
+
+        The blob's lock is taken in `db`'s transaction before the existence
+        check; insert the referencing row in that same transaction.
+        """
+
+    @abstractmethod
+    async def read(self, key: str) -> bytes:
+        """Return the contents of the blob stored under `key`"""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Check whether a blob is stored under `key`"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove the blob stored under `key`"""
+
+    def local_path(self, key: str) -> Path | None:
+        """Filesystem path the blob can be served from, or None if it is remote"""
+        return Path(key) if blob_sha256(key) is None else None
+
+    @abstractmethod
+    async def download_url(self, key: str, filename: str, disposition: str) -> str | None:
+        """
+        Time-limited URL serving a remote blob directly to the client, or None
+        if the backend only serves blobs through `local_path`
+        """
+
+
+class LocalResumeStorage(ResumeStorage):
+    """
+    Stores blobs on the local filesystem under `root`
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.tmp_dir = root / ".tmp"
+
+    def path_for(self, key: str) -> Path:
+        if blob_sha256(key) is None:
+            return Path(key)
+        return self.root / key
+
+    def local_path(self, key: str) -> Path | None:
+        return self.path_for(key)
+
+    async def save(
+        self,
+        db: AsyncSession,
+        upload: UploadFile,
+        max_size: int,
+        validator: FormatValidator | None = None,
+    ) -> StoredBlob:
+        spooled = await spool_upload(upload, self.tmp_dir, max_size, validator=validator)
+        key = blob_key(spooled.sha256)
+        target = self.path_for(key)
+        try:
+            await lock_blob(db, key)
+            if target.exists():
+                return StoredBlob(key=key, size=spooled.size, sha256=spooled.sha256, created=False)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(spooled.path, target)
+        finally:
+            spooled.path.unlink(missing_ok=True)
+        return StoredBlob(key=key, size=spooled.size, sha256=spooled.sha256, created=True)
+
+    async def read(self, key: str) -> bytes:
+        return await asyncio.to_thread(self.path_for(key).read_bytes)
+
+    async def exists(self, key: str) -> bool:
+        return self.path_for(key).exists()
+
+    async def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    async def download_url(self, key: str, filename: str, disposition: str) -> str | None:
+        return None
+
+
+class S3ResumeStorage(ResumeStorage):
+    """
+    Stores blobs in an S3-compatible bucket.
+
+    Uploads are spooled to a local temp file first, because the key is only
+    known once the whole file has been hashed. Point `endpoint_url` at MinIO
+    or another local stand-in for development.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str | None = None,
+        region_name: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+    ):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError("The s3 resume storage backend requires boto3") from e
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region_name or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+        )
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    async def save(
+        self,
+        db: AsyncSession,
+        upload: UploadFile,
+        max_size: int,
+        validator: FormatValidator | None = None,
+    ) -> StoredBlob:
+        spooled = await spool_upload(
+            upload, Path(tempfile.gettempdir()), max_size, validator=validator
+        )
+        key = blob_key(spooled.sha256)
+        try:
+            await lock_blob(db, key)
+            if await self.exists(key):
+                return StoredBlob(key=key, size=spooled.size, sha256=spooled.sha256, created=False)
+            await asyncio.to_thread(
+                self.client.upload_file, str(spooled.path), self.bucket, self._object_key(key)
+            )
+        finally:
+            os.remove(spooled.path)
+        return StoredBlob(key=key, size=spooled.size, sha256=spooled.sha256, created=True)
+
+    async def read(self, key: str) -> bytes:
+        def download() -> bytes:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+            return response["Body"].read()
+
+        return await asyncio.to_thread(download)
+
+    async def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            await asyncio.to_thread(
+                self.client.head_object, Bucket=self.bucket, Key=self._object_key(key)
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self.client.delete_object, Bucket=self.bucket, Key=self._object_key(key)
+        )
+
+    async def download_url(self, key: str, filename: str, disposition: str) -> str:
+        return await asyncio.to_thread(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._object_key(key),
+                "ResponseContentDisposition": f"{disposition}; filename*=utf-8''{quote(filename)}",
+            },
+            ExpiresIn=DOWNLOAD_URL_TTL_SECONDS,
+        )
+
+
+@lru_cache
+def get_resume_storage() -> ResumeStorage:
+    """
+    Dependency returning the configured resume storage backend
+    """
+    backend = settings.RESUME_STORAGE_BACKEND
+    if backend == "local":
+        return LocalResumeStorage(Path(settings.RESUME_STORAGE_DIR))
+    if backend == "s3":
+        return S3ResumeStorage(
+            bucket=settings.S3_BUCKET,
+            prefix=settings.S3_PREFIX,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region_name=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        )
+    raise ValueError(f"Unknown resume storage backend: {backend}")
+
+
+async def lock_blob(db: AsyncSession, key: str) -> None:
+    """
+    Lock a blob key until the current transaction of `db` ends
+    """
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(key))))
+
+
+async def count_references(db: AsyncSession, key: str) -> int:
+    """
+    Count applications referencing a blob
+    """
+    result = await db.execute(
+        select(func.count()).select_from(Application).where(Application.resume_path == key)
+    )
+    return result.scalar_one()
+
+
+async def release_blob(db: AsyncSession, storage: ResumeStorage, key: str) -> bool:
+    """
+    Delete a blob once no application references it.
+
+    Takes the blob's lock in `db`'s transaction, which the caller ends once
+    this returns. Returns True if the blob was removed.
+    """
+    await lock_blob(db, key)
+    if await count_references(db, key) > 0:
+        return False
+    await storage.delete(key)
+    logger.info("Removed unreferenced resume blob %s", key)
+    return True
@@ -0,0 +1,208 @@
+"""
+Plain-text extraction from resume files
+
+Runs in worker processes (see app.services.resume_text), so this module
+only imports the standard library at load time. The format is detected
+from the file's leading bytes rather than its name. pypdf is imported
+only once a PDF turns up.
+"""
+import io
+import re
+import zipfile
+from xml.etree import ElementTree
+
+# Upper bound on the uncompressed size of a DOCX's main XML part
+MAX_DOCX_XML_SIZE = 50 * 1024 * 1024
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# RTF groups whose text is not document content
+_RTF_SKIP_DESTINATIONS = {
+    "fonttbl",
+    "colortbl",
+    "stylesheet",
+    "info",
+    "pict",
+    "object",
+    "header",
+    "footer",
+    "headerl",
+    "headerr",
+    "footerl",
+    "footerr",
+    "listtable",
+    "listoverridetable",
+    "rsidtbl",
+    "generator",
+    "xmlnstbl",
+    "themedata",
+    "colorschememapping",
+    "datastore",
+    "latentstyles",
+    "fldinst",
+}
+_RTF_TOKEN = re.compile(
+    rb"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|([^\\{}\r\n]+)",
+    re.IGNORECASE,
+)
+_WHITESPACE = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+class ExtractionError(Exception):
+    """
+    Raised when a file cannot be parsed
+    """
+
+
+class UnsupportedFormatError(ExtractionError):
+    """
+    Raised for formats text cannot be extracted from; retrying will not help
+    """
+
+
+def detect_format(data: bytes) -> str:
+    """
+    Classify a file by its leading bytes: "pdf", "docx", "rtf" or "text"
+    """
+    if data.startswith(b"%PDF-"):
+        return "pdf"
+    if data.startswith(b"PK\x03\x04"):
+        return "docx"
+    if data.startswith(b"{\\rtf"):
+        return "rtf"
+    if data.startswith(b"\xd0\xcf\x11\xe0"):
+        raise UnsupportedFormatError("Legacy binary Word (.doc) files are not supported")
+    if b"\x00" in data[:4096] and not data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        raise UnsupportedFormatError("Unrecognised binary file")
+    return "text"
+
+
+def extract_text(data: bytes, max_chars: int) -> str:
+    """
+    Extract normalised plain text from a resume, truncated to `max_chars`
+    """
+    extractors = {
+        "pdf": _pdf_text,
+        "docx": _docx_text,
+        "rtf": _rtf_text,
+        "text": _plain_text,
+    }
+    try:
+        text = extractors[detect_format(data)](data)
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"{type(e).__name__}: {e}") from e
+    return _normalise(text)[:max_chars]
+
+
+def _normalise(text: str) -> str:
+    # Postgres text cannot hold NUL characters
+    text = text.replace("\x00", "").replace("\r\n", "\n").replace("\r", "\n")
+    text = _WHITESPACE.sub(" ", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def _plain_text(data: bytes) -> str:
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16")
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+
+def _pdf_text(data: bytes) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    if reader.is_encrypted:
+        raise UnsupportedFormatError("Encrypted PDF")
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _docx_text(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        try:
+            info = archive.getinfo("word/document.xml")
+        except KeyError:
+            raise UnsupportedFormatError("ZIP file is not a Word document")
+        if info.file_size > MAX_DOCX_XML_SIZE:
+            raise ExtractionError("Word document body is too large")
+        root = ElementTree.fromstring(archive.read(info))
+
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NS}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{_WORD_NS}t" and node.text:
+                parts.append(node.text)
+            elif node.tag == f"{_WORD_NS}tab":
+                parts.append("\t")
+            elif node.tag in (f"{_WORD_NS}br", f"{_WORD_NS}cr"):
+                parts.append("\n")
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs)
+
+
+def _rtf_text(data: bytes) -> str:
+    out: list[str] = []
+    # Per group: (skipping, chars to skip after \uN)
+    stack: list[tuple[bool, int]] = []
+    skipping = False
+    unicode_skip = 1
+    pending_skip = 0
+    ignorable = False
+
+    for match in _RTF_TOKEN.finditer(data):
+        word, arg, hex_char, symbol, brace, text = match.groups()
+        if brace == b"{":
+            stack.append((skipping, unicode_skip))
+            ignorable = False
+            continue
+        if brace == b"}":
+            if stack:
+                skipping, unicode_skip = stack.pop()
+            continue
+        if word is not None:
+            name = word.decode("ascii").lower()
+            if ignorable or name in _RTF_SKIP_DESTINATIONS:
+                skipping = True
+            ignorable = False
+            if skipping:
+                continue
+            if name in ("par", "line", "sect", "page", "row"):
+                out.append("\n")
+            elif name in ("tab", "cell"):
+                out.append("\t")
+            elif name == "uc" and arg is not None:
+                unicode_skip = int(arg)
+            elif name == "u" and arg is not None:
+                code = int(arg)
+                out.append(chr(code + 65536 if code < 0 else code))
+                pending_skip = unicode_skip
+            continue
+        if symbol is not None:
+            if symbol == b"*":
+                ignorable = True
+            elif not skipping and symbol in (b"\\", b"{", b"}"):
+                out.append(symbol.decode())
+            elif not skipping and symbol == b"~":
+                out.append("\u00a0")
+            continue
+        if skipping:
+            continue
+        if hex_char is not None:
+            if pending_skip:
+                pending_skip -= 1
+            else:
+                out.append(bytes.fromhex(hex_char.decode()).decode("cp1252", errors="replace"))
+        elif text is not None:
+            chunk = text.decode("cp1252", errors="replace")
+            if pending_skip:
+                skipped = min(pending_skip, len(chunk))
+                chunk = chunk[skipped:]
+                pending_skip -= skipped
+            out.append(chunk)
+    return "".join(out)
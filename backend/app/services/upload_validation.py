@@ -0,0 +1,149 @@
+"""
+Resume content validation
+
+Uploads are checked in two stages. `FormatValidator.check_head` sniffs the
+file signature from the first chunk of the stream, before anything is
+written to disk, and rejects content that does not match the extension.
+`FormatValidator.check_file` then runs cheap structural checks on the
+spooled file; it does blocking I/O, so callers run it in a worker thread.
+"""
+from pathlib import Path
+import codecs
+import zipfile
+
+# Formats accepted for each allowed extension. Word saves RTF and DOCX
+# content under .doc too, and opens it fine.
+EXTENSION_FORMATS = {
+    ".pdf": ("pdf",),
+    ".doc": ("doc", "docx", "rtf"),
+    ".docx": ("docx",),
+    ".txt": ("text",),
+    ".rtf": ("rtf",),
+}
+
+SIGNATURES = (
+    (b"%PDF-", "pdf"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "doc"),  # OLE compound file
+    (b"PK\x03\x04", "docx"),
+    (b"{\\rtf", "rtf"),
+)
+
+# PDF readers look for the end-of-file marker within the last 1KB
+PDF_EOF_WINDOW = 1024
+OLE_HEADER_SIZE = 512
+READ_SIZE = 64 * 1024
+
+
+class InvalidUploadError(Exception):
+    """
+    Raised when an upload's content is not an accepted resume format
+    """
+
+
+def sniff_format(head: bytes) -> str | None:
+    """
+    Identify a file from its leading bytes: "pdf", "doc", "docx", "rtf",
+    "text" (UTF-8 without NUL bytes) or None
+    """
+    for signature, name in SIGNATURES:
+        if head.startswith(signature):
+            return name
+    if b"\x00" not in head:
+        try:
+            # Not final: the chunk may end inside a multi-byte character
+            codecs.getincrementaldecoder("utf-8")().decode(head)
+        except UnicodeDecodeError:
+            return None
+        return "text"
+    return None
+
+
+class FormatValidator:
+    """
+    Checks that an upload's content matches the format its extension claims
+    """
+
+    def __init__(self, extension: str, deep: bool = True):
+        self.extension = extension
+        self.formats = EXTENSION_FORMATS[extension]
+        self.deep = deep
+        self.detected: str | None = None
+
+    def check_head(self, head: bytes) -> None:
+        """
+        Validate the first chunk of the upload
+        """
+        if not head:
+            raise InvalidUploadError("Resume file is empty")
+        detected = sniff_format(head)
+        if detected not in self.formats:
+            raise InvalidUploadError(f"File content does not match its {self.extension} extension")
+        self.detected = detected
+
+    def check_file(self, path: Path) -> None:
+        """
+        Structural checks on the complete file (blocking)
+        """
+        if self.deep and self.detected is not None:
+            _STRUCTURE_CHECKS[self.detected](path)
+
+
+def _check_pdf(path: Path) -> None:
+    with open(path, "rb") as f:
+        f.seek(max(0, path.stat().st_size - PDF_EOF_WINDOW))
+        if b"%%EOF" not in f.read():
+            raise InvalidUploadError("PDF file is truncated or corrupt")
+
+
+def _check_doc(path: Path) -> None:
+    with open(path, "rb") as f:
+        header = f.read(OLE_HEADER_SIZE)
+    # Compound file header: little-endian byte order mark, then a sector
+    # shift of 9 (512-byte sectors) or 12 (4096-byte sectors)
+    if (
+        len(header) < OLE_HEADER_SIZE
+        or header[28:30] != b"\xfe\xff"
+        or header[30:32] not in (b"\x09\x00", b"\x0c\x00")
+    ):
+        raise InvalidUploadError("Word document is truncated or corrupt")
+
+
+def _check_docx(path: Path) -> None:
+    # Reads the central directory only; nothing is decompressed
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+    except zipfile.BadZipFile:
+        raise InvalidUploadError("Word document is truncated or corrupt")
+    if not {"[Content_Types].xml", "word/document.xml"} <= names:
+        raise InvalidUploadError("ZIP file is not a Word document")
+
+
+def _check_rtf(path: Path) -> None:
+    with open(path, "rb") as f:
+        f.seek(max(0, path.stat().st_size - 64))
+        tail = f.read()
+    if not tail.rstrip(b"\x00 \t\r\n").endswith(b"}"):
+        raise InvalidUploadError("RTF file is truncated or corrupt")
+
+
+def _check_text(path: Path) -> None:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(READ_SIZE):
+                if b"\x00" in chunk:
+                    raise InvalidUploadError("Text file contains binary data")
+                decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise InvalidUploadError("Text file is not valid UTF-8")
+
+
+_STRUCTURE_CHECKS = {
+    "pdf": _check_pdf,
+    "doc": _check_doc,
+    "docx": _check_docx,
+    "rtf": _check_rtf,
+    "text": _check_text,
+}
@@ -0,0 +1,87 @@
+"""
+Streaming upload handling
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import asyncio
+import hashlib
+import os
+import tempfile
+
+from fastapi import UploadFile
+
+from app.services.upload_validation import FormatValidator
+
+CHUNK_SIZE = 64 * 1024  # 64KB
+
+
+class UploadTooLargeError(Exception):
+    """
+    Raised when an upload exceeds the allowed size
+    """
+
+    def __init__(self, max_size: int):
+        super().__init__(f"Upload exceeds {max_size} bytes")
+        self.max_size = max_size
+
+
+@dataclass
+class StoredUpload:
+    """
+    Result of streaming an upload to disk
+    """
+
+    path: Path
+    size: int
+    sha256: str
+
+
+async def spool_upload(
+    upload: UploadFile,
+    directory: Path,
+    max_size: int,
+    chunk_size: int = CHUNK_SIZE,
+    validator: FormatValidator | None = None,
+) -> StoredUpload:
+    """
+    Copy an upload into a new temp file inside `directory`, chunk by chunk.
+
+    The size limit is enforced as bytes arrive and the SHA-256 digest is
+    computed on the fly, so memory use is bounded by `chunk_size`. With a
+    `validator`, the first chunk is sniffed before a temp file is created
+    and the structural checks run in a worker thread once it is complete.
+    The caller owns the returned temp file and must rename or remove it.
+    """
+    # Reject early when the multipart parser already knows the size
+    if upload.size is not None and upload.size > max_size:
+        raise UploadTooLargeError(max_size)
+
+    chunk = await upload.read(chunk_size)
+    if validator is not None:
+        validator.check_head(chunk)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    os.close(fd)
+    os.chmod(tmp_name, 0o644)
+
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        import aiofiles  # only needed once a file is actually uploaded
+
+        async with aiofiles.open(tmp_name, "wb") as f:
+            while chunk:
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(max_size)
+                hasher.update(chunk)
+                await f.write(chunk)
+                chunk = await upload.read(chunk_size)
+        if validator is not None:
+            await asyncio.to_thread(validator.check_file, Path(tmp_name))
+    except BaseException:
+        os.remove(tmp_name)
+        raise
+
+    return StoredUpload(path=Path(tmp_name), size=size, sha256=hasher.hexdigest())
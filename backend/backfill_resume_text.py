@@ -0,0 +1,49 @@
+"""
+Script to queue resume text extraction for applications stored before it existed
+Usage: python backfill_resume_text.py [--retry-failed] [--process]
+(connection settings from POSTGRES_* / .env)
+
+Queued rows are picked up by running API workers. With --process the queue
+is drained in this process instead, which suits a one-off backfill run
+while the API has extraction disabled.
+"""
+import argparse
+import asyncio
+
+from app.db.session import AsyncSessionLocal, engine
+from app.services.resume_text import ResumeTextExtractor, queue_missing, requeue_failed
+
+
+async def backfill(retry_failed: bool, process: bool) -> tuple[int, int, int]:
+    """Queue missing (and optionally failed) resumes, then optionally drain the queue"""
+    requeued = processed = 0
+    try:
+        async with AsyncSessionLocal() as session:
+            queued = await queue_missing(session)
+            if retry_failed:
+                requeued = await requeue_failed(session)
+            await session.commit()
+        if process:
+            processed = await ResumeTextExtractor.from_settings().drain()
+    finally:
+        await engine.dispose()
+    return queued, requeued, processed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill resume text extraction")
+    parser.add_argument(
+        "--retry-failed", action="store_true", help="Also retry extractions that gave up"
+    )
+    parser.add_argument(
+        "--process", action="store_true", help="Drain the queue here instead of in the API"
+    )
+    args = parser.parse_args()
+
+    print("Queueing resumes for text extraction...")
+    queued, requeued, processed = asyncio.run(backfill(args.retry_failed, args.process))
+    print(f"✅ Queued {queued} resumes")
+    if args.retry_failed:
+        print(f"✅ Requeued {requeued} failed extractions")
+    if args.process:
+        print(f"✅ Processed {processed} resumes")
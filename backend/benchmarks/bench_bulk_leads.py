@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark single-record vs bulk lead ingestion
+
+Drives the ASGI app in-process against the database configured in
+Settings and compares POST /leads (one request per lead) with
+POST /leads/bulk. Inserted rows are left in place; point it at a
+scratch database.
+
+Usage: python benchmarks/bench_bulk_leads.py [--count 2000]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# Thousands of POSTs from one client would otherwise be rate limited
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.main import app, lifespan  # noqa: E402
+
+
+def make_lead(i: int, tag: str) -> dict:
+    # Unique addresses, so lead deduplication does not merge the runs
+    return {
+        "name": f"Bench User {i}",
+        "email": f"bench-{tag}-{i}@example.com",
+        "company": "Benchmark Corp",
+        "job_title": "Engineer",
+        "phone": "+15550100",
+        "project_description": "Benchmarking the lead ingestion throughput.",
+    }
+
+
+async def run(count: int) -> None:
+    logging.disable(logging.INFO)
+    run_id = uuid4().hex[:8]
+    single_leads = [make_lead(i, f"single-{run_id}") for i in range(count)]
+    bulk_leads = [make_lead(i, f"bulk-{run_id}") for i in range(count)]
+    url = f"{settings.API_V1_STR}/leads"
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"Inserting {count} leads one request at a time...")
+            start = time.perf_counter()
+            for lead in single_leads:
+                response = await client.post(url, json=lead)
+                response.raise_for_status()
+            single = time.perf_counter() - start
+
+            print(f"Inserting {count} leads with one bulk request...")
+            start = time.perf_counter()
+            response = await client.post(f"{url}/bulk", json=bulk_leads)
+            response.raise_for_status()
+            bulk = time.perf_counter() - start
+            assert response.json()["created"] == count
+
+    print("\n" + "=" * 60)
+    print(f"Single: {single:8.3f}s  {count / single:10.1f} leads/s")
+    print(f"Bulk:   {bulk:8.3f}s  {count / bulk:10.1f} leads/s")
+    print(f"Speedup: {single / bulk:.1f}x")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=2000, help="leads per run")
+    asyncio.run(run(parser.parse_args().count))
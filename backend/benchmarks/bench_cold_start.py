@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold starts for each DB_STARTUP_CHECK mode
+
+Every sample runs in a fresh interpreter (as a serverless cold start
+does) and measures importing `app.main`, running the lifespan startup
+and serving a first request. Statements issued during startup are
+counted; `--rtt-ms` adds a simulated network round trip to each one, to
+approximate a remote database from a local one.
+
+Usage: python benchmarks/bench_cold_start.py [--runs 5] [--rtt-ms 30]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+MODES = ("create_all", "revision", "skip")
+
+
+def child(rtt_ms: float) -> None:
+    """
+    Measure one cold start and print the timings as JSON
+    """
+    import asyncio
+    import logging
+
+    start = time.perf_counter()
+    sys.path.insert(0, str(BACKEND_DIR))
+    import httpx
+    from sqlalchemy import event
+
+    from app.db.session import engine
+    from app.main import app, lifespan
+
+    imported = time.perf_counter()
+    logging.disable(logging.INFO)
+
+    statements = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+        if rtt_ms:
+            time.sleep(rtt_ms / 1000)
+
+    async def run() -> dict:
+        async with lifespan(app):
+            started = time.perf_counter()
+            startup_statements = statements
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                response = await client.get("/health")
+                response.raise_for_status()
+            served = time.perf_counter()
+        return {
+            "import_ms": (imported - start) * 1000,
+            "startup_ms": (started - imported) * 1000,
+            "first_request_ms": (served - started) * 1000,
+            "total_ms": (served - start) * 1000,
+            "startup_statements": startup_statements,
+        }
+
+    print(json.dumps(asyncio.run(run())))
+
+
+def sample(mode: str, rtt_ms: float) -> dict:
+    env = {**os.environ, "DB_STARTUP_CHECK": mode}
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", "--rtt-ms", str(rtt_ms)],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--rtt-ms", type=float, default=0.0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.rtt_ms)
+        return
+
+    print(f"🚀 {args.runs} cold starts per mode, simulated RTT {args.rtt_ms:g}ms")
+    print(f"{'mode':<12}{'import':>10}{'startup':>10}{'1st req':>10}{'total':>10}{'stmts':>7}")
+    results = {}
+    for mode in MODES:
+        runs = [sample(mode, args.rtt_ms) for _ in range(args.runs)]
+        median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        results[mode] = median
+        print(
+            f"{mode:<12}{median['import_ms']:>8.0f}ms{median['startup_ms']:>8.0f}ms"
+            f"{median['first_request_ms']:>8.0f}ms{median['total_ms']:>8.0f}ms"
+            f"{median['startup_statements']:>7.0f}"
+        )
+
+    baseline = results["create_all"]["startup_ms"]
+    for mode in MODES[1:]:
+        saved = baseline - results[mode]["startup_ms"]
+        print(f"✅ {mode}: startup {saved:.0f}ms faster than create_all")
+
+
+if __name__ == "__main__":
+    main()
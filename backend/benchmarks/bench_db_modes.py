@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request database latency for each DB_MODE
+
+Each simulated request opens a session, runs the lead list query and
+commits, exactly like GET /leads. Point `--url` at a pgbouncer in
+transaction mode (e.g. port 6432) in front of a local Postgres to check
+that serverless mode works behind it; pooled mode with asyncpg's
+prepared statement cache is expected to fail there.
+
+Usage: python benchmarks/bench_db_modes.py [--url=postgresql+asyncpg://...]
+       [--requests=500] [--concurrency=10]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.session import build_engine  # noqa: E402
+from app.models.lead import Lead  # noqa: E402
+
+MODES = ("pooled", "serverless")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def bench_mode(mode: str, url: str, requests: int, concurrency: int) -> None:
+    engine = build_engine(mode, url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    query = select(Lead).order_by(Lead.created_at.desc(), Lead.id.desc()).limit(20)
+    latencies: list[float] = []
+    errors: list[str] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                async with sessions() as session:
+                    (await session.scalars(query)).all()
+                    await session.commit()
+            except Exception as e:
+                errors.append(type(e).__name__)
+                return
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    if not latencies:
+        print(f"❌ {mode:<11} all {requests} requests failed ({errors[0]})")
+        return
+    mark = "✅" if not errors else "❌"
+    print(
+        f"{mark} {mode:<11} p50 {statistics.median(latencies):6.2f}ms  "
+        f"p95 {percentile(latencies, 95):6.2f}ms  p99 {percentile(latencies, 99):6.2f}ms  "
+        f"{len(latencies) / elapsed:7.0f} req/s  errors {len(errors)}"
+    )
+
+
+async def run(url: str, requests: int, concurrency: int) -> None:
+    logging.disable(logging.INFO)
+    print(f"🚀 {requests} requests per mode, concurrency {concurrency}")
+    for mode in MODES:
+        await bench_mode(mode, url, requests, concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Measure the overhead the rate limiter adds to allowed requests
+
+Calls RateLimitMiddleware directly around a no-op ASGI app, so only the
+limiter itself is timed, for a hot client and for a stream of distinct
+clients that keeps the bucket store at capacity (eviction path).
+
+Usage: python benchmarks/bench_rate_limiter.py [--requests=200000]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.rate_limit import RateLimit, RateLimitMiddleware  # noqa: E402
+
+PATH = "/api/v1/leads"
+
+
+async def noop_app(scope, receive, send) -> None:
+    pass
+
+
+def make_scope(ip: str, path: str = PATH) -> dict:
+    return {"type": "http", "method": "POST", "path": path, "headers": [], "client": (ip, 1234)}
+
+
+async def timed(middleware, scopes: list[dict]) -> float:
+    start = time.perf_counter()
+    for scope in scopes:
+        await middleware(scope, None, None)
+    return (time.perf_counter() - start) / len(scopes) * 1e6
+
+
+async def run(requests: int) -> None:
+    # Generous limit: every call is allowed, so only the fast path is timed
+    limit = RateLimit(rate=1e9, burst=10**9)
+
+    baseline = await timed(noop_app, [make_scope("10.0.0.1")] * requests)
+    hot = RateLimitMiddleware(noop_app, {PATH: limit}, max_entries=100000)
+    hot_us = await timed(hot, [make_scope("10.0.0.1")] * requests)
+    churn = RateLimitMiddleware(noop_app, {PATH: limit}, max_entries=10000)
+    churn_us = await timed(
+        churn, [make_scope(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}") for i in range(requests)]
+    )
+    other = await timed(hot, [make_scope("10.0.0.1", "/api/v1/other")] * requests)
+
+    print(f"no-op app:                 {baseline:6.2f} µs/request")
+    print(f"limited route, one client: {hot_us - baseline:6.2f} µs added")
+    print(
+        f"limited route, new client: {churn_us - baseline:6.2f} µs added "
+        f"({len(churn.buckets)} buckets kept)"
+    )
+    print(f"unlimited route:           {other - baseline:6.2f} µs added")
+
+
+if __name__ == "__main__":
+    requests = 200000
+    for arg in sys.argv[1:]:
+        if arg.startswith("--requests="):
+            requests = int(arg.split("=", 1)[1])
+    asyncio.run(run(requests))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of list response serialization
+
+Compares the validating path (model_validate per row, then FastAPI's
+jsonable_encoder and JSONResponse) with the trusted fast path
+(trusted_rows + dumps) over in-memory Lead and Application rows. No
+database is needed. The two paths must produce identical bytes.
+
+Usage: python benchmarks/bench_serialization.py [--rows 10000]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.core.responses import dumps, trusted_rows  # noqa: E402
+from app.models.application import Application  # noqa: E402
+from app.models.lead import Lead  # noqa: E402
+from app.schemas.application import ApplicationResponse  # noqa: E402
+from app.schemas.lead import LeadResponse  # noqa: E402
+
+
+def make_leads(count: int) -> list[Lead]:
+    now = datetime.utcnow()
+    return [
+        Lead(
+            id=i,
+            name=f"Bench User {i}",
+            email=f"bench{i}@example.com",
+            company="Benchmark Corp",
+            job_title="Engineer",
+            phone="+1 555 010 0000" if i % 2 else None,
+            project_description="We need help migrating our platform to Kubernetes. " * 4,
+            created_at=now - timedelta(seconds=i),
+            updated_at=now - timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def make_applications(count: int) -> list[Application]:
+    now = datetime.now(timezone.utc)
+    return [
+        Application(
+            id=i,
+            first_name="Bench",
+            last_name=f"Applicant {i}",
+            email=f"applicant{i}@example.com",
+            phone="+15550100000",
+            linkedin_url="https://www.linkedin.com/in/bench" if i % 2 else None,
+            resume_filename="resume.pdf",
+            note=None,
+            created_at=now - timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def validating(rows, schema) -> bytes:
+    return JSONResponse(jsonable_encoder([schema.model_validate(row) for row in rows])).body
+
+
+def trusted(rows, schema) -> bytes:
+    return dumps(trusted_rows(rows, schema))
+
+
+def best_of(func, rows, schema, repeat: int = 5) -> tuple[float, bytes]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func(rows, schema)
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+
+def main(count: int) -> None:
+    print(f"🚀 {count} rows per run, best of 5")
+    for name, rows, schema in (
+        ("LeadResponse", make_leads(count), LeadResponse),
+        ("ApplicationResponse", make_applications(count), ApplicationResponse),
+    ):
+        slow, slow_body = best_of(validating, rows, schema)
+        fast, fast_body = best_of(trusted, rows, schema)
+        mark = "✅" if slow_body == fast_body else "❌ output differs,"
+        print(
+            f"{mark} {name:<20} validating {slow / count * 1e6:6.2f} µs/row   "
+            f"trusted {fast / count * 1e6:6.2f} µs/row   {slow / fast:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000, help="rows per run")
+    main(parser.parse_args().rows)
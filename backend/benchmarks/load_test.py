@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Load test the API and record a latency/throughput baseline
+
+Runs each scenario with a fixed number of concurrent clients and reports
+throughput and p50/p95/p99 latency per endpoint as JSON. `--target=asgi`
+drives the app in-process through httpx's ASGI transport, which measures
+the application and database without sockets; `--target=uvicorn` starts
+one local uvicorn worker and goes over real sockets; `--url` points at a
+server that is already running.
+
+Writes go to the database configured in Settings and are left in place;
+point it at a scratch database. Rate limiting is disabled for the
+in-process and spawned servers, since every request comes from one client.
+
+Usage: python benchmarks/load_test.py [--target=asgi|uvicorn] [--url=http://...]
+       [--scenarios=create_lead,create_application,list_leads,list_applications]
+       [--requests=1000] [--concurrency=200] [--warmup=20]
+       [--output=baseline.json] [--compare=baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+# Every request comes from one client and would otherwise be rate limited
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+
+API = settings.API_V1_STR
+RESUME_SIZE = 64 * 1024
+
+Scenario = Callable[[httpx.AsyncClient, int, str], Awaitable[httpx.Response]]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def resume_bytes(tag: str) -> bytes:
+    # Unique per request, so content-addressed storage writes a new blob
+    # every time like real uploads. The %%EOF trailer passes upload validation.
+    header = f"%PDF-1.4\n% load test resume {tag}\n".encode()
+    trailer = b"\n%%EOF\n"
+    return header + b"0" * (RESUME_SIZE - len(header) - len(trailer)) + trailer
+
+
+async def create_lead(client: httpx.AsyncClient, i: int, run_id: str) -> httpx.Response:
+    # Unique addresses, so lead deduplication does not merge requests
+    return await client.post(
+        f"{API}/leads",
+        json={
+            "name": f"Load Test {i}",
+            "email": f"load-{run_id}-{i}@example.com",
+            "company": f"Load Test Corp {i % 50}",
+            "job_title": "Engineer",
+            "phone": "+15550100",
+            "project_description": "Load testing the contact form submission path.",
+        },
+    )
+
+
+async def create_application(client: httpx.AsyncClient, i: int, run_id: str) -> httpx.Response:
+    return await client.post(
+        f"{API}/applications",
+        data={
+            "first_name": "Load",
+            "last_name": f"Test {i}",
+            "email": f"load-{run_id}-{i}@example.com",
+            "phone": "+15550100000",
+        },
+        files={"resume": (f"resume-{i}.pdf", resume_bytes(f"{run_id}-{i}"), "application/pdf")},
+    )
+
+
+async def list_leads(client: httpx.AsyncClient, i: int, run_id: str) -> httpx.Response:
+    return await client.get(f"{API}/leads", params={"limit": 20, "cursor": ""})
+
+
+async def list_applications(client: httpx.AsyncClient, i: int, run_id: str) -> httpx.Response:
+    return await client.get(f"{API}/applications", params={"limit": 20, "cursor": ""})
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "create_lead": create_lead,
+    "create_application": create_application,
+    "list_leads": list_leads,
+    "list_applications": list_applications,
+}
+
+
+@dataclass
+class ScenarioResult:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+
+    def summary(self) -> dict:
+        ok = self.latencies
+        return {
+            "requests": len(ok) + sum(self.errors.values()),
+            "status_codes": {str(code): count for code, count in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+            "duration_s": round(self.elapsed, 3),
+            "throughput_rps": round(len(ok) / self.elapsed, 1) if self.elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(statistics.median(ok), 2),
+                "p95": round(percentile(ok, 95), 2),
+                "p99": round(percentile(ok, 99), 2),
+                "mean": round(statistics.fmean(ok), 2),
+                "max": round(max(ok), 2),
+            }
+            if ok
+            else None,
+        }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    run_id: str,
+) -> ScenarioResult:
+    """
+    Closed loop: `concurrency` clients each send their next request as soon
+    as the previous one completes, until `requests` have been sent
+    """
+    result = ScenarioResult()
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, i, run_id)
+            except httpx.HTTPError as e:
+                result.errors[type(e).__name__] += 1
+                continue
+            result.latencies.append((time.perf_counter() - start) * 1000)
+            result.statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def run_all(client: httpx.AsyncClient, args: argparse.Namespace) -> dict:
+    run_id = uuid4().hex[:8]
+    results = {}
+    for name in args.scenarios:
+        scenario = SCENARIOS[name]
+        if args.warmup:
+            await run_scenario(client, scenario, args.warmup, args.concurrency, f"{run_id}-w")
+        result = await run_scenario(client, scenario, args.requests, args.concurrency, run_id)
+        results[name] = result.summary()
+        print_line(name, results[name])
+    return results
+
+
+def print_line(name: str, summary: dict) -> None:
+    latency = summary["latency_ms"]
+    failures = summary["requests"] - sum(
+        count for code, count in summary["status_codes"].items() if int(code) < 400
+    )
+    mark = "✅" if not failures else "❌"
+    if latency is None:
+        print(f"{mark} {name:<19} all {summary['requests']} requests failed {summary['errors']}")
+        return
+    print(
+        f"{mark} {name:<19} {summary['throughput_rps']:8.1f} req/s  "
+        f"p50 {latency['p50']:7.2f}ms  p95 {latency['p95']:7.2f}ms  "
+        f"p99 {latency['p99']:7.2f}ms  failures {failures}"
+    )
+
+
+async def run_in_process(args: argparse.Namespace) -> dict:
+    from app.main import app, lifespan
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await run_all(client, args)
+
+
+async def run_over_http(url: str, args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        return await run_all(client, args)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(port: int) -> subprocess.Popen:
+    """
+    Start one uvicorn worker and wait until it answers /health
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--no-access-log",
+            "--log-level",
+            "warning",
+        ],
+        cwd=BACKEND_DIR,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return process
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become ready within 30s")
+
+
+def compare(results: dict, baseline_path: Path) -> None:
+    """
+    Print the change against a previous run's JSON
+    """
+    baseline = json.loads(baseline_path.read_text())["scenarios"]
+    print(f"\nCompared with {baseline_path}:")
+    for name, summary in results.items():
+        before = baseline.get(name)
+        if not before or not before["latency_ms"] or not summary["latency_ms"]:
+            continue
+        changes = [
+            f"{metric} {change(before['latency_ms'][metric], summary['latency_ms'][metric])}"
+            for metric in ("p50", "p95", "p99")
+        ]
+        throughput = change(before["throughput_rps"], summary["throughput_rps"])
+        print(f"   {name:<19} req/s {throughput}  " + "  ".join(changes))
+
+
+def change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+6.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--url", help="Base URL of a running server (overrides --target)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests first")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare against")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    logging.disable(logging.INFO)
+    target = args.url or args.target
+    print(
+        f"🚀 {args.requests} requests per scenario, concurrency {args.concurrency}, "
+        f"target {target}"
+    )
+    if args.url:
+        results = asyncio.run(run_over_http(args.url, args))
+    elif args.target == "uvicorn":
+        port = free_port()
+        server = start_uvicorn(port)
+        try:
+            results = asyncio.run(run_over_http(f"http://127.0.0.1:{port}", args))
+        finally:
+            server.terminate()
+            server.wait()
+    else:
+        results = asyncio.run(run_in_process(args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "target": target,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "db_mode": settings.DB_MODE,
+            "python": platform.python_version(),
+            "host": platform.node(),
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Script to rebuild the lead analytics rollups from the leads table
+Usage: python rebuild_lead_stats.py (connection settings from POSTGRES_* / .env)
+"""
+import asyncio
+
+from app.db.session import AsyncSessionLocal, engine
+from app.services.lead_stats import rebuild_lead_stats
+
+
+async def rebuild() -> int:
+    """Recompute every rollup in one transaction"""
+    try:
+        async with AsyncSessionLocal() as session:
+            rows = await rebuild_lead_stats(session)
+            await session.commit()
+    finally:
+        await engine.dispose()
+    return rows
+
+
+if __name__ == "__main__":
+    print("Rebuilding lead stats rollups...")
+    rows = asyncio.run(rebuild())
+    print(f"✅ Rebuilt {rows} rollup rows")
@@ -0,0 +1,46 @@
+"""
+Shared test fixtures
+
+Tests that touch the database run against the one configured in Settings,
+migrated to head (`alembic upgrade head`).
+"""
+import asyncio
+import os
+
+# Every test client shares one address; the limiter has its own tests
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app.db.session import AsyncSessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    # The engine's pooled connections are bound to the loop that opened them
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+
+
+@pytest.fixture
+async def db():
+    """
+    Session whose transaction is rolled back after the test
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+        await session.rollback()
+
+
+@pytest.fixture
+async def client():
+    """
+    HTTP client driving the ASGI app in-process, without running its lifespan
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
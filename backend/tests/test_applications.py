@@ -0,0 +1,44 @@
+"""
+Application submission
+"""
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.mark.parametrize(
+    "address",
+    ["not-an-email", "jane@example.com\r\nBcc: everyone@example.com"],
+)
+async def test_invalid_email_is_rejected_before_storing(client, address):
+    response = await client.post(
+        f"{settings.API_V1_STR}/applications",
+        data={"first_name": "Jane", "last_name": "Doe", "email": address, "phone": "+15550100"},
+        files={"resume": ("resume.txt", b"Jane Doe resume", "text/plain")},
+    )
+
+    assert response.status_code == 422
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", "email"]]
+
+
+async def test_new_application_invalidates_cached_list(client):
+    url = f"{settings.API_V1_STR}/applications"
+    before = await client.get(url, params={"limit": 5})
+    assert before.status_code == 200
+
+    created = await client.post(
+        url,
+        data={
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "email": "jane@example.com",
+            "phone": "+15550100",
+        },
+        files={"resume": ("resume.txt", b"Jane Doe resume", "text/plain")},
+    )
+    assert created.status_code == 201
+
+    after = await client.get(url, params={"limit": 5})
+    assert after.status_code == 200
+    assert created.json()["id"] in [item["id"] for item in after.json()]
+    assert after.headers["etag"] != before.headers["etag"]
@@ -0,0 +1,107 @@
+"""
+Bulk lead ingestion through POST /leads/bulk
+"""
+import json
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models.lead import Lead
+
+URL = f"{settings.API_V1_STR}/leads/bulk"
+
+
+def make_lead(email: str, **overrides) -> dict:
+    return {
+        "name": "Bulk Check",
+        "email": email,
+        "company": "Bulk Corp",
+        "job_title": "Engineer",
+        "project_description": "Checking bulk lead ingestion.",
+        **overrides,
+    }
+
+
+@pytest.fixture
+def emails():
+    tag = uuid.uuid4().hex
+    return [f"bulk-{n}-{tag}@example.com" for n in range(4)]
+
+
+async def stored_count(db, emails: list[str]) -> int:
+    return await db.scalar(select(func.count()).where(func.lower(Lead.email).in_(emails)))
+
+
+async def test_valid_items_are_stored_and_invalid_ones_reported(client, db, emails):
+    response = await client.post(
+        URL,
+        json=[
+            make_lead(emails[0]),
+            make_lead("not-an-email"),
+            make_lead(emails[1], phone="+15550100"),
+            make_lead(emails[0].upper(), name="Bulk Repeat"),
+            make_lead(emails[2], company=""),
+        ],
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["merged"], body["failed"]) == (2, 1, 2)
+    results = body["results"]
+    assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+    assert results[0]["id"] is not None and results[2]["id"] is not None
+    # The repeat within the batch merges into the first item's row
+    assert (results[3]["id"], results[3]["merged"]) == (results[0]["id"], True)
+    assert [error["loc"] for error in results[1]["errors"]] == [["email"]]
+    assert [error["loc"] for error in results[4]["errors"]] == [["company"]]
+    assert results[1]["id"] is None and results[4]["id"] is None
+    assert await stored_count(db, emails) == 2
+
+
+async def test_ndjson_lines_are_validated_one_by_one(client, db, emails):
+    body = "\n".join(
+        [json.dumps(make_lead(emails[0])), "{not json", "", json.dumps(make_lead(emails[1]))]
+    )
+
+    response = await client.post(
+        URL, content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (2, 1)
+    # Blank lines are skipped, so the broken line is item 1
+    assert result["results"][1] == {
+        "index": 1,
+        "id": None,
+        "merged": False,
+        "errors": [{"msg": "Invalid JSON"}],
+    }
+    assert await stored_count(db, emails) == 2
+
+
+@pytest.mark.parametrize(
+    "content",
+    ['{"email": "single@example.com"}', "[{broken", ""],
+    ids=["object", "bad-json", "empty"],
+)
+async def test_body_that_is_not_an_array_gets_400(client, content):
+    response = await client.post(URL, content=content, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Body must be a JSON array or NDJSON"}
+
+
+async def test_batches_over_the_cap_are_rejected_whole(client, db, emails, monkeypatch):
+    monkeypatch.setattr(settings, "LEADS_BULK_MAX_ITEMS", 3)
+
+    too_many = await client.post(URL, json=[make_lead(email) for email in emails])
+    at_cap = await client.post(URL, json=[make_lead(email) for email in emails[:3]])
+
+    assert too_many.status_code == 413
+    assert too_many.json() == {"detail": "At most 3 leads per request"}
+    assert at_cap.status_code == 200
+    assert at_cap.json()["created"] == 3
+    assert await stored_count(db, emails) == 3
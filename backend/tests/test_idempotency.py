@@ -0,0 +1,176 @@
+"""
+Idempotency-Key handling, driven through IdempotencyMiddleware around a small
+ASGI app and backed by the configured database's `idempotency_keys` table
+"""
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.idempotency import IdempotencyMiddleware, claim_key, load_key
+
+PATH = "/items"
+
+
+class Endpoint:
+    """
+    Counts calls, optionally holding each one until `gate` is set
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.status = 201
+        self.entered = asyncio.Event()
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def create(self, request: Request) -> JSONResponse:
+        self.calls += 1
+        self.entered.set()
+        await self.gate.wait()
+        return JSONResponse({"call": self.calls, **await request.json()}, status_code=self.status)
+
+
+@pytest.fixture
+def endpoint():
+    return Endpoint()
+
+
+def worker(endpoint: Endpoint, wait_timeout: float = 5) -> httpx.AsyncClient:
+    """
+    A client for one "worker": its own middleware, so its own LRU and futures
+    """
+    app = IdempotencyMiddleware(
+        Starlette(routes=[Route(PATH, endpoint.create, methods=["POST"])]),
+        paths=[PATH],
+        ttl=60,
+        lock_lease=30,
+        wait_timeout=wait_timeout,
+        cache_size=16,
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def new_key() -> str:
+    return f"test-{uuid.uuid4().hex}"
+
+
+async def post(client: httpx.AsyncClient, key: str, payload: dict | None = None):
+    return await client.post(
+        PATH, json=payload or {"name": "Jane"}, headers={"Idempotency-Key": key}
+    )
+
+
+async def test_repeat_is_replayed_without_running_again(endpoint):
+    key = new_key()
+    async with worker(endpoint) as client:
+        first = await post(client, key)
+        second = await post(client, key)
+
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json() == {"call": 1, "name": "Jane"}
+    assert "idempotent-replayed" not in first.headers
+    assert second.headers["idempotent-replayed"] == "true"
+    assert endpoint.calls == 1
+
+
+async def test_repeat_on_another_worker_is_replayed_from_the_database(endpoint):
+    key = new_key()
+    async with worker(endpoint) as first_worker, worker(endpoint) as second_worker:
+        first = await post(first_worker, key)
+        second = await post(second_worker, key)
+
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert endpoint.calls == 1
+
+
+async def test_key_reused_for_different_payload_is_rejected(endpoint):
+    key = new_key()
+    async with worker(endpoint) as client:
+        await post(client, key, {"name": "Jane"})
+        response = await post(client, key, {"name": "John"})
+
+    assert response.status_code == 422
+    assert endpoint.calls == 1
+
+
+async def test_requests_without_key_are_not_deduplicated(endpoint):
+    async with worker(endpoint) as client:
+        await client.post(PATH, json={"name": "Jane"})
+        await client.post(PATH, json={"name": "Jane"})
+
+    assert endpoint.calls == 2
+
+
+async def test_error_response_releases_key(endpoint):
+    key = new_key()
+    endpoint.status = 400
+    async with worker(endpoint) as client:
+        failed = await post(client, key)
+        assert await load_key(f"{PATH}:{key}") == (False, None)
+
+        endpoint.status = 201
+        retried = await post(client, key)
+
+    assert failed.status_code == 400
+    assert retried.status_code == 201
+    assert "idempotent-replayed" not in retried.headers
+    assert endpoint.calls == 2
+    held, stored = await load_key(f"{PATH}:{key}")
+    assert held and stored.status == 201
+
+
+async def test_claim_is_exclusive_until_its_lease_expires():
+    key = new_key()
+
+    assert await claim_key(key, lease=-1)
+    # Expired: readers ignore it and the next claim takes it over
+    assert await load_key(key) == (False, None)
+    assert await claim_key(key, lease=30)
+    assert not await claim_key(key, lease=30)
+    assert await load_key(key) == (True, None)
+
+
+@pytest.mark.parametrize("same_worker", [True, False], ids=["in-process", "cross-worker"])
+async def test_concurrent_duplicate_waits_for_first(endpoint, same_worker):
+    key = new_key()
+    endpoint.gate.clear()
+    async with worker(endpoint) as first_worker, worker(endpoint) as second_worker:
+        first = asyncio.create_task(post(first_worker, key))
+        await asyncio.wait_for(endpoint.entered.wait(), 5)
+        second = asyncio.create_task(post(first_worker if same_worker else second_worker, key))
+        await asyncio.sleep(0.2)
+        assert not second.done()
+
+        endpoint.gate.set()
+        first, second = await first, await second
+
+    assert second.json() == first.json() == {"call": 1, "name": "Jane"}
+    assert second.headers["idempotent-replayed"] == "true"
+    assert endpoint.calls == 1
+
+
+@pytest.mark.parametrize("same_worker", [True, False], ids=["in-process", "cross-worker"])
+async def test_duplicate_gets_409_when_first_outlasts_wait(endpoint, same_worker):
+    key = new_key()
+    endpoint.gate.clear()
+    async with worker(endpoint, wait_timeout=0.3) as first_worker, worker(
+        endpoint, wait_timeout=0.3
+    ) as second_worker:
+        first = asyncio.create_task(post(first_worker, key))
+        await asyncio.wait_for(endpoint.entered.wait(), 5)
+
+        second = await post(first_worker if same_worker else second_worker, key)
+
+        endpoint.gate.set()
+        assert (await first).status_code == 201
+
+    assert second.status_code == 409
+    assert second.headers["retry-after"] == "1"
+    assert endpoint.calls == 1
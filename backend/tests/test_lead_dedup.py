@@ -0,0 +1,130 @@
+"""
+Repeat lead submissions merged by upsert_lead and insert_leads
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models.lead import Lead
+from app.schemas.lead import LeadCreate
+from app.services import leads
+from app.services.leads import insert_leads, upsert_lead
+
+START = datetime(2026, 3, 2, 9, 0, 0)
+
+
+def make_lead(email: str, name: str = "Jane Doe", phone: str | None = None) -> LeadCreate:
+    return LeadCreate(
+        name=name,
+        email=email,
+        company="Dedup Corp",
+        job_title="Engineer",
+        phone=phone,
+        project_description="Checking lead deduplication.",
+    )
+
+
+@pytest.fixture
+def email():
+    return f"dedup-{uuid.uuid4().hex}@example.com"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Freezes the write paths' clock; set `clock.now` to move it
+    """
+
+    class FrozenDatetime(datetime):
+        now = START
+
+        @classmethod
+        def utcnow(cls):
+            return cls.now
+
+    monkeypatch.setattr(leads, "datetime", FrozenDatetime)
+    return FrozenDatetime
+
+
+async def stored(db, email: str) -> list:
+    # Column queries bypass the identity map, so merged values are current
+    result = await db.execute(
+        select(Lead.id, Lead.name, Lead.phone)
+        .where(func.lower(Lead.email) == email.lower())
+        .order_by(Lead.id)
+    )
+    return result.all()
+
+
+async def test_repeat_within_window_merges(db, email, clock):
+    first, first_inserted = await upsert_lead(db, make_lead(email, phone="+15550100"))
+    clock.now = START + timedelta(seconds=30)
+    second, second_inserted = await upsert_lead(db, make_lead(email.upper(), name="Jane Smith"))
+
+    assert first_inserted and not second_inserted
+    assert second.id == first.id
+    # Latest name wins, but the missing phone does not erase the known one
+    assert await stored(db, email) == [(first.id, "Jane Smith", "+15550100")]
+
+
+async def test_merge_replaces_phone_when_given(db, email, clock):
+    await upsert_lead(db, make_lead(email, phone="+15550100"))
+    lead, _ = await upsert_lead(db, make_lead(email, phone="+15550199"))
+
+    assert await stored(db, email) == [(lead.id, "Jane Doe", "+15550199")]
+
+
+async def test_repeat_after_window_inserts_new_row(db, email, clock):
+    first, _ = await upsert_lead(db, make_lead(email))
+    clock.now = START + timedelta(seconds=settings.LEADS_DEDUP_WINDOW_SECONDS)
+    second, inserted = await upsert_lead(db, make_lead(email))
+
+    assert inserted
+    assert second.id != first.id
+    assert len(await stored(db, email)) == 2
+
+
+async def test_disabled_dedup_always_inserts(db, email, monkeypatch):
+    monkeypatch.setattr(settings, "LEADS_DEDUP_WINDOW_SECONDS", 0)
+
+    first, _ = await upsert_lead(db, make_lead(email))
+    second, inserted = await upsert_lead(db, make_lead(email))
+
+    assert inserted
+    assert second.dedup_bucket is None
+    assert len(await stored(db, email)) == 2
+    [(_, bulk_inserted)] = await insert_leads(db, [make_lead(email)])
+    assert bulk_inserted
+    assert len(await stored(db, email)) == 3
+
+
+async def test_bulk_collapses_duplicates_within_batch(db, email, clock):
+    other = f"other-{email}"
+
+    outcomes = await insert_leads(
+        db,
+        [
+            make_lead(email, phone="+15550100"),
+            make_lead(other),
+            make_lead(email.upper(), name="Jane Smith"),
+        ],
+    )
+
+    [(first_id, first_inserted), (other_id, other_inserted), (dup_id, dup_inserted)] = outcomes
+    assert first_inserted and other_inserted and not dup_inserted
+    assert dup_id == first_id != other_id
+    # The last duplicate wins, as if the batch had been submitted in order
+    assert await stored(db, email) == [(first_id, "Jane Smith", None)]
+
+
+async def test_bulk_merges_into_existing_row(db, email, clock):
+    existing, _ = await upsert_lead(db, make_lead(email, phone="+15550100"))
+    clock.now = START + timedelta(seconds=30)
+
+    [(lead_id, inserted)] = await insert_leads(db, [make_lead(email, name="Jane Smith")])
+
+    assert (lead_id, inserted) == (existing.id, False)
+    assert await stored(db, email) == [(existing.id, "Jane Smith", "+15550100")]
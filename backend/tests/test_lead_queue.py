@@ -0,0 +1,141 @@
+"""
+Write-behind lead batching and the spill file that keeps failed batches
+"""
+import asyncio
+
+import pytest
+
+from app.schemas.lead import LeadCreate
+from app.services import lead_queue
+from app.services.lead_queue import LeadIngestionQueue, QueuedLead, SpillFile
+
+
+def make_lead(n: int) -> LeadCreate:
+    return LeadCreate(
+        name=f"Lead {n}",
+        email=f"lead-{n}@example.com",
+        company="Queue Corp",
+        job_title="Engineer",
+        project_description="Checking write-behind batching.",
+    )
+
+
+class FakeDatabase:
+    """
+    Stands in for insert_leads, recording each batch and failing while `down`
+    """
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+        self.down = False
+
+    async def insert_leads(self, session, leads):
+        if self.down:
+            raise ConnectionError("database unavailable")
+        self.batches.append([lead.email for lead in leads])
+        return [(i, True) for i, _ in enumerate(leads)]
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(lead_queue, "insert_leads", database.insert_leads)
+    return database
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return tmp_path / "spool" / "leads.ndjson"
+
+
+def make_queue(spill_path) -> LeadIngestionQueue:
+    return LeadIngestionQueue(
+        max_size=100,
+        batch_size=3,
+        flush_interval=0.2,
+        enqueue_timeout=1,
+        max_retries=1,
+        spill_path=spill_path,
+    )
+
+
+@pytest.fixture
+async def queue(database, spill_path):
+    queue = make_queue(spill_path)
+    queue.start()
+    yield queue
+    await queue.stop(5)
+
+
+async def drain(queue: LeadIngestionQueue) -> None:
+    await asyncio.wait_for(queue._queue.join(), 5)
+
+
+async def test_full_batch_flushes_before_the_interval(database, queue):
+    queue.flush_interval = 30
+    for n in range(3):
+        await queue.submit(make_lead(n))
+
+    await drain(queue)
+
+    assert database.batches == [[f"lead-{n}@example.com" for n in range(3)]]
+
+
+async def test_partial_batch_flushes_after_the_interval(database, queue):
+    await queue.submit(make_lead(0))
+    await queue.submit(make_lead(1))
+
+    await drain(queue)
+
+    assert database.batches == [["lead-0@example.com", "lead-1@example.com"]]
+
+
+async def test_failed_batch_is_spilled_then_replayed(database, queue, spill_path):
+    database.down = True
+    await queue.submit(make_lead(0))
+    await drain(queue)
+
+    assert database.batches == []
+    [spilled] = SpillFile(spill_path).read()
+    assert spilled.lead == make_lead(0)
+
+    database.down = False
+    await queue.submit(make_lead(1))
+    await drain(queue)
+
+    assert database.batches == [["lead-1@example.com"], ["lead-0@example.com"]]
+    assert not spill_path.exists()
+
+
+async def test_spilled_leads_are_replayed_at_start(database, spill_path):
+    SpillFile(spill_path).append([QueuedLead(lead=make_lead(n)) for n in range(4)])
+    with spill_path.open("a") as f:
+        # Cut short by a crash mid-append
+        f.write('{"id": "trunc\n')
+    queue = make_queue(spill_path)
+
+    queue.start()
+    for _ in range(100):
+        if not spill_path.exists():
+            break
+        await asyncio.sleep(0.01)
+    await queue.stop(5)
+
+    assert database.batches == [
+        ["lead-0@example.com", "lead-1@example.com", "lead-2@example.com"],
+        ["lead-3@example.com"],
+    ]
+    assert not spill_path.exists()
+
+
+async def test_leftovers_are_spilled_on_shutdown(database, spill_path):
+    database.down = True
+    queue = make_queue(spill_path)
+    queue.flush_interval = 30
+    queue.start()
+    await queue.submit(make_lead(0))
+    await asyncio.sleep(0.05)
+
+    await queue.stop(0.1)
+
+    assert [item.lead for item in SpillFile(spill_path).read()] == [make_lead(0)]
@@ -0,0 +1,104 @@
+"""
+Lead rollups kept by the triggers on leads, read through /leads/stats, and
+rebuild_lead_stats
+"""
+import uuid
+from collections import Counter
+
+from sqlalchemy import delete, select, update
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.lead import Lead
+from app.models.lead_stat import LeadStat
+from app.schemas.lead import LeadCreate
+from app.services.lead_stats import rebuild_lead_stats
+from app.services.leads import upsert_lead
+
+URL = f"{settings.API_V1_STR}/leads"
+
+
+def lead_payload(email: str, company: str, job_title: str = "Engineer") -> dict:
+    return {
+        "name": "Stats Check",
+        "email": email,
+        "company": company,
+        "job_title": job_title,
+        "project_description": "Checking the lead rollups.",
+    }
+
+
+async def get_stats(client) -> dict:
+    response = await client.get(f"{URL}/stats", params={"days": 1, "top": 100})
+    assert response.status_code == 200
+    stats = response.json()
+    return {
+        "total": stats["total"],
+        "today": stats["by_day"][-1]["leads"],
+        "companies": {group["value"]: group["leads"] for group in stats["by_company"]},
+    }
+
+
+async def test_triggers_follow_inserts_merges_and_deletes(client):
+    tag = uuid.uuid4().hex
+    first_company, second_company = f"First {tag}", f"Second {tag}"
+    emails = [f"stats-a-{tag}@example.com", f"stats-b-{tag}@example.com"]
+    before = await get_stats(client)
+
+    for email, company in zip(emails, [first_company, second_company]):
+        response = await client.post(URL, json=lead_payload(email, company))
+        assert response.status_code == 201
+    inserted = await get_stats(client)
+
+    assert inserted["total"] == before["total"] + 2
+    assert inserted["today"] == before["today"] + 2
+    assert inserted["companies"][first_company] == 1
+    assert inserted["companies"][second_company] == 1
+
+    # Merging the first lead under the second company moves it between rollups
+    response = await client.post(URL, json=lead_payload(emails[0].upper(), second_company))
+    assert response.status_code == 200
+    merged = await get_stats(client)
+
+    assert merged["total"] == inserted["total"]
+    assert merged["today"] == inserted["today"]
+    assert first_company not in merged["companies"]
+    assert merged["companies"][second_company] == 2
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Lead).where(Lead.email.in_(emails)))
+        await session.commit()
+    deleted = await get_stats(client)
+
+    assert deleted["total"] == before["total"]
+    assert deleted["today"] == before["today"]
+    assert second_company not in deleted["companies"]
+
+
+async def test_rebuild_recomputes_rollups_from_leads(db):
+    tag = uuid.uuid4().hex
+    for n, company in enumerate(["Alpha", "Alpha", "Beta"]):
+        await upsert_lead(
+            db, LeadCreate(**lead_payload(f"rebuild-{n}-{tag}@example.com", f"{company} {tag}"))
+        )
+    # Drift the rollups away from leads
+    await db.execute(update(LeadStat).values(leads=LeadStat.leads + 7))
+    await db.execute(delete(LeadStat).where(LeadStat.dimension == "company"))
+
+    rows = await rebuild_lead_stats(db)
+
+    leads = (await db.execute(select(Lead.created_at, Lead.company, Lead.job_title))).all()
+    expected = Counter()
+    for created_at, company, job_title in leads:
+        expected.update(
+            [
+                ("total", ""),
+                ("day", created_at.date().isoformat()),
+                ("company", company),
+                ("job_title", job_title),
+            ]
+        )
+    stats = (await db.execute(select(LeadStat.dimension, LeadStat.value, LeadStat.leads))).all()
+    assert {(dimension, value): count for dimension, value, count in stats} == expected
+    assert rows == len(expected)
+    assert expected[("company", f"Alpha {tag}")] == 2
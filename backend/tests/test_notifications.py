@@ -0,0 +1,107 @@
+"""
+Acknowledgement emails delivered through NotificationDispatcher to a local
+aiosmtpd server
+"""
+import asyncio
+import email
+import logging
+import socket
+
+import pytest
+
+from app.services.notifications import (
+    NotificationDispatcher,
+    SMTPConnection,
+    application_acknowledgement,
+    lead_acknowledgement,
+)
+
+REJECTED = "rejected@example.com"
+
+
+class RecordingHandler:
+    """
+    aiosmtpd handler keeping every delivered message and refusing REJECTED
+    """
+
+    def __init__(self):
+        self.messages: list[email.message.Message] = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REJECTED:
+            return "550 5.1.1 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(email.message_from_bytes(envelope.content))
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    handler = RecordingHandler()
+    controller = controller_module.Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+@pytest.fixture
+async def dispatcher(smtp_server):
+    dispatcher = NotificationDispatcher(
+        connections=[
+            SMTPConnection(
+                host=smtp_server.hostname,
+                port=smtp_server.port,
+                username="",
+                password="",
+                starttls=False,
+                timeout=5,
+            )
+        ],
+        max_size=10,
+        batch_size=5,
+        batch_interval=0.01,
+        max_retries=2,
+        idle_timeout=30,
+    )
+    dispatcher.start()
+    yield dispatcher
+    await dispatcher.stop(5)
+
+
+async def test_queued_acknowledgements_are_delivered(smtp_server, dispatcher):
+    assert dispatcher.enqueue(application_acknowledgement("Jane", "jane@example.com"))
+    assert dispatcher.enqueue(lead_acknowledgement("John", "john@example.com"))
+
+    await dispatcher.stop(5)
+
+    messages = smtp_server.handler.messages
+    assert [message["To"] for message in messages] == ["jane@example.com", "john@example.com"]
+    assert messages[0]["Subject"] == "We received your application"
+    assert "Hi Jane," in messages[0].get_payload()
+
+
+async def test_rejected_recipient_is_not_retried(smtp_server, dispatcher, caplog):
+    caplog.set_level(logging.ERROR, logger="app.services.notifications")
+    dispatcher.enqueue(application_acknowledgement("Rita", REJECTED))
+    dispatcher.enqueue(application_acknowledgement("Jane", "jane@example.com"))
+
+    for _ in range(100):
+        if any("Giving up" in record.getMessage() for record in caplog.records):
+            break
+        await asyncio.sleep(0.05)
+
+    assert dispatcher.retrying == 0
+    assert [message["To"] for message in smtp_server.handler.messages] == ["jane@example.com"]
+    # aiosmtpd's server thread may log before set_level applies
+    [record] = [r for r in caplog.records if r.name == "app.services.notifications"]
+    assert record.getMessage().startswith(f"Giving up on email to {REJECTED} after 1 attempt(s)")
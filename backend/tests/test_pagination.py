@@ -0,0 +1,135 @@
+"""
+Keyset pagination: cursor encoding, seek predicates and cursor-paged lists
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.pagination import (
+    InvalidCursorError,
+    created_before,
+    decode_cursor,
+    encode_cursor,
+)
+from app.models.application import Application
+
+PREFIX = settings.API_V1_STR
+
+
+@pytest.mark.parametrize(
+    "values, types",
+    [
+        ((datetime(2026, 3, 2, 9, 30, 15, 123456), 42), (datetime, int)),
+        ((datetime(2026, 3, 2, 9, 30, tzinfo=timezone(timedelta(hours=2))), 7), (datetime, int)),
+        ((0.0607927, 9), (float, int)),
+    ],
+)
+def test_cursor_round_trips(values, types):
+    cursor = encode_cursor(*values)
+
+    assert decode_cursor(cursor, *types) == values
+    # Opaque and URL-safe, without padding
+    assert cursor.replace("-", "").replace("_", "").isalnum()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        "e30",  # base64 of {}
+        encode_cursor(datetime(2026, 3, 2)),
+        encode_cursor(datetime(2026, 3, 2), 1, 2),
+        encode_cursor("yesterday", 1),
+        encode_cursor(datetime(2026, 3, 2), "one"),
+    ],
+)
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, datetime, int)
+
+
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/leads", {}),
+        ("/applications", {}),
+        ("/leads/search", {"q": "engineer"}),
+    ],
+)
+async def test_invalid_cursor_gets_400(client, path, params):
+    response = await client.get(f"{PREFIX}{path}", params={**params, "cursor": "garbage"})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid pagination cursor"}
+
+
+async def test_created_at_ties_are_broken_by_id(db):
+    # One transaction, so server_default now() gives every row the same
+    # tz-aware created_at
+    tag = uuid.uuid4().hex
+    db.add_all(
+        Application(
+            first_name="Tie",
+            last_name=str(n),
+            email=f"tie-{tag}@example.com",
+            phone="+15550100",
+            resume_filename="resume.txt",
+            resume_path=f"tie/{tag}/{n}",
+        )
+        for n in range(5)
+    )
+    await db.flush()
+
+    query = (
+        select(Application.id, Application.created_at)
+        .where(Application.email == f"tie-{tag}@example.com")
+        .order_by(Application.created_at.desc(), Application.id.desc())
+        .limit(2)
+    )
+    rows = (await db.execute(query)).all()
+    pages = [rows]
+    while rows:
+        last = rows[-1]
+        cursor = encode_cursor(last.created_at, last.id)
+        page = query.where(created_before(Application.created_at, Application.id, cursor))
+        rows = (await db.execute(page)).all()
+        pages.append(rows)
+
+    ids = [row.id for page in pages for row in page]
+    assert len({row.created_at for page in pages for row in page}) == 1
+    assert [len(page) for page in pages] == [2, 2, 1, 0]
+    assert ids == sorted(ids, reverse=True)
+
+
+async def create_lead(client) -> int:
+    response = await client.post(
+        f"{PREFIX}/leads",
+        json={
+            "name": "Page Check",
+            "email": f"page-{uuid.uuid4().hex}@example.com",
+            "company": "Paging Corp",
+            "job_title": "Engineer",
+            "project_description": "Checking keyset pagination.",
+        },
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def test_pages_are_stable_when_rows_are_inserted(client):
+    url = f"{PREFIX}/leads"
+    for _ in range(4):
+        await create_lead(client)
+    expected = [lead["id"] for lead in (await client.get(url, params={"limit": 4})).json()]
+
+    first = await client.get(url, params={"limit": 2, "cursor": ""})
+    # Newer rows would shift an OFFSET page, but not a seek past the cursor
+    inserted = {await create_lead(client) for _ in range(2)}
+    second = await client.get(url, params={"limit": 2, "cursor": first.headers["x-next-cursor"]})
+
+    ids = [lead["id"] for lead in first.json() + second.json()]
+    assert ids == expected
+    assert not inserted & set(ids)
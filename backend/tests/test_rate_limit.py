@@ -0,0 +1,152 @@
+"""
+Per-client token buckets in RateLimitMiddleware, driven around a small ASGI
+app (the application's own limiter is disabled for the test session)
+"""
+import logging
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.rate_limit import RateLimit, RateLimitMiddleware
+
+PATH = "/submit"
+# Two requests, then one more every 60 seconds
+LIMIT = RateLimit.per_minute(1, burst=2)
+
+
+async def submit(request: Request) -> JSONResponse:
+    return JSONResponse(await request.json(), status_code=201)
+
+
+async def show(request: Request) -> JSONResponse:
+    return JSONResponse({})
+
+
+def limited_app(trusted_proxy_hops: int = 0) -> RateLimitMiddleware:
+    return RateLimitMiddleware(
+        Starlette(
+            routes=[
+                Route(PATH, submit, methods=["POST"]),
+                Route(PATH, show, methods=["GET"]),
+                Route("/other", submit, methods=["POST"]),
+            ]
+        ),
+        limits={PATH: LIMIT},
+        max_entries=1000,
+        trusted_proxy_hops=trusted_proxy_hops,
+    )
+
+
+def client_for(app, ip: str = "198.51.100.1") -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app, client=(ip, 50000))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+async def statuses(client: httpx.AsyncClient, count: int, **kwargs) -> list[int]:
+    return [(await client.post(PATH, json={}, **kwargs)).status_code for _ in range(count)]
+
+
+async def test_each_client_ip_has_its_own_bucket():
+    app = limited_app()
+    async with client_for(app, "198.51.100.1") as first, client_for(app, "198.51.100.2") as second:
+        assert await statuses(first, 3) == [201, 201, 429]
+        assert await statuses(second, 2) == [201, 201]
+
+        response = await first.post(PATH, json={})
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) > 0
+
+
+async def test_only_limited_posts_are_counted():
+    app = limited_app()
+    async with client_for(app) as client:
+        gets = [(await client.get(PATH)).status_code for _ in range(3)]
+        others = [(await client.post("/other", json={})).status_code for _ in range(3)]
+        assert await statuses(client, 3) == [201, 201, 429]
+
+    assert gets == [200, 200, 200]
+    assert others == [201, 201, 201]
+
+
+@pytest.mark.parametrize(
+    "forwarded_for, hops, expected",
+    [
+        ("203.0.113.7", 1, "203.0.113.7"),
+        # Entries before the trusted hops are client-supplied and ignored
+        ("10.9.9.9, 203.0.113.7", 1, "203.0.113.7"),
+        ("10.9.9.9, 203.0.113.7, 192.0.2.1", 2, "203.0.113.7"),
+        # Fewer entries than hops: the first one
+        ("203.0.113.7", 3, "203.0.113.7"),
+        # No trusted proxies: the header is not believed
+        ("203.0.113.7", 0, "198.51.100.1"),
+    ],
+)
+def test_client_ip_is_taken_from_trusted_hop(forwarded_for, hops, expected):
+    scope = {
+        "client": ("198.51.100.1", 50000),
+        "headers": [(b"x-forwarded-for", forwarded_for.encode())],
+    }
+
+    assert limited_app(hops)._client_ip(scope) == expected
+
+
+async def test_spoofed_forwarded_entries_share_the_real_clients_bucket():
+    app = limited_app(trusted_proxy_hops=1)
+    async with client_for(app, "192.0.2.1") as proxy:
+        results = [
+            (
+                await proxy.post(
+                    PATH, json={}, headers={"X-Forwarded-For": f"10.0.0.{n}, 203.0.113.7"}
+                )
+            ).status_code
+            for n in range(3)
+        ]
+        other = await statuses(proxy, 1, headers={"X-Forwarded-For": "203.0.113.8"})
+
+    assert results == [201, 201, 429]
+    assert other == [201]
+
+
+async def test_forwarded_requests_without_trusted_hops_log_a_warning(caplog):
+    caplog.set_level(logging.WARNING, logger="app.core.rate_limit")
+    app = limited_app()
+    async with client_for(app) as client:
+        await statuses(client, 2, headers={"X-Forwarded-For": "203.0.113.7"})
+
+    [record] = caplog.records
+    assert "RATE_LIMIT_TRUSTED_PROXY_HOPS" in record.getMessage()
+
+
+async def test_limited_request_is_rejected_before_its_body_is_read():
+    app = limited_app()
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": PATH,
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("198.51.100.1", 50000),
+    }
+    reads = 0
+
+    async def receive():
+        nonlocal reads
+        reads += 1
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    for _ in range(LIMIT.burst):
+        app.buckets.acquire(("198.51.100.1", PATH), LIMIT)
+
+    await app(scope, receive, send)
+
+    assert reads == 0
+    assert sent[0]["status"] == 429
@@ -0,0 +1,120 @@
+"""
+Resume downloads through RangedFileResponse: Range, If-Range and
+If-None-Match against a blob in local storage
+"""
+import hashlib
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.services.storage import LocalResumeStorage, get_resume_storage
+
+URL = f"{settings.API_V1_STR}/applications"
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = LocalResumeStorage(tmp_path / "resumes")
+    app.dependency_overrides[get_resume_storage] = lambda: storage
+    yield storage
+    app.dependency_overrides.pop(get_resume_storage)
+
+
+@pytest.fixture
+def content():
+    # Unique, so each test stores a fresh blob
+    return "".join(f"Line {n}: resume {uuid.uuid4().hex}\n" for n in range(20)).encode()
+
+
+@pytest.fixture
+async def resume_url(client, storage, content):
+    response = await client.post(
+        URL,
+        data={
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "email": "jane@example.com",
+            "phone": "+15550100",
+        },
+        files={"resume": ("resume.txt", content, "text/plain")},
+    )
+    assert response.status_code == 201
+    return f"{URL}/{response.json()['id']}/resume"
+
+
+@pytest.fixture
+def etag(content):
+    return f'"{hashlib.sha256(content).hexdigest()}"'
+
+
+async def test_full_download(client, resume_url, content, etag):
+    response = await client.get(resume_url)
+
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["etag"] == etag
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == str(len(content))
+    assert "content-range" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "header, start, end",
+    [
+        ("bytes=0-9", 0, 9),
+        ("bytes=100-", 100, None),
+        ("bytes=-16", -16, None),
+        # An end past the file is clamped to its last byte
+        ("bytes=10-1000000", 10, None),
+    ],
+)
+async def test_range_gets_partial_content(client, resume_url, content, header, start, end):
+    expected = content[start : None if end is None else end + 1]
+    first = start % len(content)
+
+    response = await client.get(resume_url, headers={"Range": header})
+
+    assert response.status_code == 206
+    assert response.content == expected
+    assert response.headers["content-length"] == str(len(expected))
+    assert response.headers["content-range"] == (
+        f"bytes {first}-{first + len(expected) - 1}/{len(content)}"
+    )
+
+
+@pytest.mark.parametrize("header", [f"bytes={10**6}-", "bytes=-0"])
+async def test_unsatisfiable_range_gets_416(client, resume_url, content, header):
+    response = await client.get(resume_url, headers={"Range": header})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(content)}"
+
+
+@pytest.mark.parametrize("header", ["bytes=0-1,5-6", "items=0-9", "bytes=9-0"])
+async def test_unsupported_range_gets_whole_file(client, resume_url, content, header):
+    response = await client.get(resume_url, headers={"Range": header})
+
+    assert response.status_code == 200
+    assert response.content == content
+    assert "content-range" not in response.headers
+
+
+async def test_if_range_mismatch_gets_whole_file(client, resume_url, content, etag):
+    stale = await client.get(resume_url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    current = await client.get(resume_url, headers={"Range": "bytes=0-9", "If-Range": etag})
+
+    assert stale.status_code == 200
+    assert stale.content == content
+    assert current.status_code == 206
+    assert current.content == content[:10]
+
+
+async def test_if_none_match_gets_304(client, resume_url, etag):
+    response = await client.get(resume_url, headers={"If-None-Match": f'"other", W/{etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"].startswith("private")
@@ -0,0 +1,75 @@
+"""
+Database round-trips per write request
+
+Drives the ASGI app in-process and counts statements and commits per
+request through SQLAlchemy engine events. The app's lifespan is not run, so
+no background worker shares the engine while a request is measured.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db.session import engine
+
+PREFIX = settings.API_V1_STR
+
+
+class StatementCounter:
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def _statement(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+
+    def _commit(self, conn):
+        self.commits += 1
+
+
+@pytest.fixture
+def counter():
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter._statement)
+    event.listen(engine.sync_engine, "commit", counter._commit)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter._statement)
+    event.remove(engine.sync_engine, "commit", counter._commit)
+
+
+def unique_email() -> str:
+    return f"statements-{uuid.uuid4().hex}@example.com"
+
+
+async def test_create_lead_is_one_statement(client, counter):
+    response = await client.post(
+        f"{PREFIX}/leads",
+        json={
+            "name": "Statement Check",
+            "email": unique_email(),
+            "company": "Benchmark Corp",
+            "job_title": "Engineer",
+            "project_description": "Counting statements per request.",
+        },
+    )
+
+    assert response.status_code == 201
+    assert (counter.statements, counter.commits) == (1, 1)
+
+
+async def test_create_application_is_lock_plus_insert(client, counter):
+    response = await client.post(
+        f"{PREFIX}/applications",
+        data={
+            "first_name": "Statement",
+            "last_name": "Check",
+            "email": unique_email(),
+            "phone": "+15550100",
+        },
+        files={"resume": ("resume.txt", b"Statement check resume", "text/plain")},
+    )
+
+    assert response.status_code == 201
+    # The blob's advisory lock, then the INSERT that also queues text extraction
+    assert (counter.statements, counter.commits) == (2, 1)
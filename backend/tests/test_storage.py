@@ -0,0 +1,123 @@
+"""
+Content-addressed resume storage against the local filesystem and moto's S3
+"""
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.models.application import Application
+from app.services.storage import (
+    LocalResumeStorage,
+    S3ResumeStorage,
+    blob_key,
+    release_blob,
+)
+from app.services.upload_validation import FormatValidator, InvalidUploadError
+
+RESUME = b"Jane Doe\nPlatform engineer: Kubernetes, Terraform, Go\n"
+KEY = blob_key(hashlib.sha256(RESUME).hexdigest())
+BUCKET = "resumes"
+
+
+def upload(data: bytes = RESUME, filename: str = "resume.txt") -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename)
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    return LocalResumeStorage(tmp_path / "resumes")
+
+
+@pytest.fixture
+def s3_storage(monkeypatch):
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        yield S3ResumeStorage(bucket=BUCKET, prefix="blobs", region_name="us-east-1")
+
+
+@pytest.fixture(params=["local", "s3"])
+def storage(request):
+    return request.getfixturevalue(f"{request.param}_storage")
+
+
+async def test_save_stores_blob_under_sharded_key(db, storage):
+    blob = await storage.save(db, upload(), 1024)
+
+    assert blob.key == KEY
+    assert blob.key.startswith(f"{blob.sha256[:2]}/{blob.sha256[2:4]}/")
+    assert blob.size == len(RESUME)
+    assert blob.created
+    assert await storage.read(KEY) == RESUME
+
+
+async def test_save_deduplicates_identical_content(db, storage):
+    first = await storage.save(db, upload(), 1024)
+    second = await storage.save(db, upload(filename="other-name.txt"), 1024)
+
+    assert second.key == first.key
+    assert not second.created
+    assert await storage.read(KEY) == RESUME
+
+
+async def test_rejected_upload_is_not_stored(db, storage):
+    with pytest.raises(InvalidUploadError):
+        await storage.save(db, upload(filename="resume.pdf"), 1024, FormatValidator(".pdf"))
+
+    assert not await storage.exists(KEY)
+
+
+async def test_delete_removes_blob(db, storage):
+    await storage.save(db, upload(), 1024)
+
+    await storage.delete(KEY)
+
+    assert not await storage.exists(KEY)
+    # Deleting again is a no-op
+    await storage.delete(KEY)
+
+
+async def test_release_keeps_referenced_blob(db, storage):
+    blob = await storage.save(db, upload(), 1024)
+    db.add(
+        Application(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane@example.com",
+            phone="+15550100",
+            resume_filename="resume.txt",
+            resume_path=blob.key,
+        )
+    )
+    await db.flush()
+
+    assert not await release_blob(db, storage, blob.key)
+    assert await storage.exists(blob.key)
+
+
+async def test_release_deletes_unreferenced_blob(db, storage):
+    blob = await storage.save(db, upload(), 1024)
+
+    assert await release_blob(db, storage, blob.key)
+    assert not await storage.exists(blob.key)
+
+
+async def test_s3_objects_live_under_prefix(db, s3_storage):
+    await s3_storage.save(db, upload(), 1024)
+
+    listing = s3_storage.client.list_objects_v2(Bucket=BUCKET)
+    assert [item["Key"] for item in listing["Contents"]] == [f"blobs/{KEY}"]
+
+    url = await s3_storage.download_url(KEY, "Jane Doe.txt", "attachment")
+    assert f"/blobs/{KEY}" in url
+    assert "response-content-disposition=attachment" in url
+
+
+async def test_local_storage_serves_from_disk(local_storage):
+    assert local_storage.local_path(KEY) == local_storage.root / KEY
+    assert await local_storage.download_url(KEY, "resume.txt", "inline") is None
@@ -0,0 +1,106 @@
+"""
+Resume content checks on POST /applications and in spool_upload
+"""
+import io
+import zipfile
+
+import pytest
+from fastapi import UploadFile
+
+from app.api.v1.endpoints.applications import MAX_FILE_SIZE
+from app.core.config import settings
+from app.main import app
+from app.services.storage import LocalResumeStorage, get_resume_storage
+from app.services.upload_validation import FormatValidator, InvalidUploadError
+from app.services.uploads import UploadTooLargeError, spool_upload
+
+URL = f"{settings.API_V1_STR}/applications"
+
+PDF = b"%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+
+def docx(names=("[Content_Types].xml", "word/document.xml")) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name in names:
+            archive.writestr(name, "<xml/>")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = LocalResumeStorage(tmp_path / "resumes")
+    app.dependency_overrides[get_resume_storage] = lambda: storage
+    yield storage
+    app.dependency_overrides.pop(get_resume_storage)
+
+
+@pytest.mark.parametrize(
+    "filename, content, detail",
+    [
+        ("resume.pdf", PDF, None),
+        ("resume.docx", docx(), None),
+        ("resume.txt", "Jane Doe, ingénieure\n".encode(), None),
+        ("resume.pdf", b"Jane Doe\nPlatform engineer\n", "does not match its .pdf extension"),
+        ("resume.pdf", PDF.replace(b"%%EOF", b""), "PDF file is truncated or corrupt"),
+        ("resume.docx", docx(["notes.txt"]), "ZIP file is not a Word document"),
+        ("resume.docx", docx()[:40], "Word document is truncated or corrupt"),
+        ("resume.txt", b"Jane\x00Doe", "does not match its .txt extension"),
+        ("resume.txt", b"", "Resume file is empty"),
+        ("resume.txt", b"x" * (MAX_FILE_SIZE + 1), "File size exceeds 5MB limit"),
+    ],
+    ids=[
+        "pdf",
+        "docx",
+        "txt",
+        "fake-pdf",
+        "truncated-pdf",
+        "zip-not-docx",
+        "truncated-docx",
+        "binary-txt",
+        "empty",
+        "oversized",
+    ],
+)
+async def test_resume_content_is_validated(client, storage, filename, content, detail):
+    response = await client.post(
+        URL,
+        data={
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "email": "jane@example.com",
+            "phone": "+15550100",
+        },
+        files={"resume": (filename, content, "application/octet-stream")},
+    )
+
+    if detail is None:
+        assert response.status_code == 201
+        assert response.json()["resume_filename"] == filename
+    else:
+        assert response.status_code == 400
+        assert detail in response.json()["detail"]
+        # Neither a blob nor a temp file is left behind
+        assert not [path for path in storage.root.rglob("*") if path.is_file()]
+
+
+@pytest.mark.parametrize(
+    "content, error",
+    [
+        (PDF.replace(b"%%EOF", b""), InvalidUploadError),
+        (PDF * 100, UploadTooLargeError),
+    ],
+)
+async def test_rejected_spool_leaves_no_temp_file(tmp_path, content, error):
+    upload = UploadFile(io.BytesIO(content), filename="resume.pdf")
+
+    with pytest.raises(error):
+        await spool_upload(
+            upload,
+            tmp_path,
+            max_size=len(PDF) * 2,
+            chunk_size=64,
+            validator=FormatValidator(".pdf"),
+        )
+
+    assert list(tmp_path.iterdir()) == []